@@ -1,39 +1,43 @@
 import heapq
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections import deque
+from functools import partial
+from itertools import islice
+from multiprocessing import Barrier, Pool, Process
+from multiprocessing.shared_memory import SharedMemory
 
-def optimalRoute(start:int, end:int ,passengers:list, roads:list)->list:
+def optimalRoute(start:int, end:int ,passengers:list, roads:list, mode:str="dijkstra")->list:
     """
     Function decription: finds the most optimal path in a list of roads with carpool and singular paths, this then returns the list of 
     this path.
 
 
-    function approach: I first wanted arrays with each one corresponding to a node so i could look up in O(1)
-    I also implemented the algorithm with a queue so i can use this greedy algorithm and have the best update and pop complexities O(log|L|).
-    This queue would work even without having a another vertex array to keep track of its position as we would disreagard the value popped if it was
-    not equal to the current estimate we had for it and not involved in a passenger calculation.
-    for the inside of the while loop it worked by first getting the shortest distance in queue currently and then first checking if their 
-    is a passenger, if there isnt it will try relax the node as it loop through the edges it is connected to. if there is a passenger 
-    then pick them up because it will always improve or keep time the same, then let it try to relax it against the distances or passenger_dist as
-    distances could be ahead, this allows it to stay in queue, thus allowing the passenger route to be searched we would also pass on whether or not it had
-    a passenger so we could determine what to check it against.
-    For these passenger routes where distance[with_passneger] is not less than the actual weight it will go through the carpool lanes and 
-    update passenger_dist exclusively until it is a better option than what was in distances before.
-    This enables the algorithm to be correct whether a passenger coming helps or not as it will not terminate until those paths have been completed
-    as well and reflected in the arrays.
-    The path finding was done by going through the passenger_dist first, if valid, then the singular distances one. This would 
-    get the full path even when there was no passenger picked up, we would also keep track of the index because when they align it means thats where we picked up
-    so thats where we go into the singular distances loop.
-    We then return this finished path.
+    function approach: the problem is modelled as two copies (layers) of the road network, layer 0 is driving alone and uses the solo
+    lane times, layer 1 is driving with a passenger and uses the carpool lane times. Each (location, has_passenger) pair is a state with
+    id location + has_passenger*|L|, and arriving at a location with a passenger while alone moves us straight into layer 1 as picking 
+    them up is free. This is then just a normal dijkstra over the 2|L| states with a heap queue, disregarding popped values which are
+    not equal to the current estimate we have for that state.
+    As dijkstra settles states in order of distance, the first time a state for end is popped is the fastest way to reach end, whether
+    or not a passenger was picked up, so we stop there instead of draining the rest of the queue.
+    The path is then found by following the single predecessor array of states back from that end state to the start, converting each
+    state back to its location. We then return this finished path.
     -----------------------------------------------------------------------------------------------------------------------------------
 
     given L is the list of key locations and R the roads list:
 
-    the make_adjacency_list function costs O(|L|+|R|) time and aux space as we make a new list of the vertices and edges assosciated with.
+    compiling the RoadNetwork costs O(|L|+|R|) time and aux space as we make flat arrays of the vertices and edges assosciated with,
+    this only has to be done once per roads list and can then be reused for every query through RoadNetwork.route.
 
-    the dijiksrata_algo function costs O(|P|log|L|+|R|log|L|+|L|log|L|+|L|+|P|) time as we pop and push from the queue hence adding log|L| complexity and as we have to 
-                                                            push further O(|P|) times on top of regular O(|R|) this also means we pop it more but does not change complexity
-                                                            as the term that dominates is the |R|log|L| as |R| >= |L| > |P|
-                                                            therefore time complexity is: O(|R|log|L|)
-                                the algo costs O(|L|) aux space complexity as we only add arrays of size |L| 
+    the dijiksrata_algo function costs O(|R|log|L|) time as every road is relaxed at most once per layer, so O(2|R|) pushes and pops
+                                from the queue each costing O(log|L|), and it can stop early once end is settled
+                                the algo costs O(|L|) aux space complexity as we only add arrays of size 2|L|
 
                                 the traceback function does not add to any of the complexities at O(|L|) aux space and time
     -----------------------------------------------------------------------------------------------------------------------------------
@@ -41,7 +45,8 @@ def optimalRoute(start:int, end:int ,passengers:list, roads:list)->list:
     @param start: integer of the starting node.
     @param end: integer of the ending node
     @param passengers: the list of nodes where passengers can be picked up
-    @param roads: a list of tuples representing the roads
+    @param roads: a list of tuples representing the roads, or an already compiled (or loaded) RoadNetwork
+    @param mode: "dijkstra" or "alt" for the landmark guided search, see RoadNetwork.route
     @return the most optimal path, fastest route, from start to end
 
     time complexity: O(|L|+|R|+|R|log|L|) -> O(|R|log|L|)
@@ -49,191 +54,1605 @@ def optimalRoute(start:int, end:int ,passengers:list, roads:list)->list:
     
     """
     
-    adjacency_list = make_adjacency_list(roads)                     #time: and space = O(|L|+|R|)
-    output = dijisktra_algo(adjacency_list,start,end,passengers)    #time: O(|R|log|L|) space: O(|L|)
+    if isinstance(roads,RoadNetwork):
+        network = roads
+    else:
+        network = RoadNetwork(roads)                                #time: and space = O(|L|+|R|)
+    output = network.route(start,end,passengers,mode)               #time: O(|R|log|L|) space: O(|L|)
     
     return output
-    
-def make_adjacency_list(graph: list) -> list: 
+
+
+def optimalRoute_batch(roads:list, queries:list, workers:int=None, chunksize:int=64, mode:str="dijkstra")->list:
     """
-    Function Description: transforms the roads graph into an adjacency list and returns said adjacency list.
+    Function decription: answers many optimalRoute queries on the same roads, compiling the network once and 
+    spreading the queries over a pool of processes that all read the same compiled arrays from shared memory.
 
-    @param graph: a matrix representing the road
-    @return: the list representing the adjacency list
+    @param roads: a list of tuples representing the roads
+    @param queries: a list of (start, end, passengers) tuples
+    @param workers: the amount of processes, defaults to the amount of cpus
+    @param chunksize: how many queries are handed to a process at a time
+    @param mode: the search mode, see RoadNetwork.route
+    @return the list of paths in the same order as queries
 
-    time complexity: O(|L|+|R|) where L is the key locations (nodes) and R the roads (edges)
-    aux space complexity: O(|L|+|R|) where L is the key locations (nodes) and R the roads (edges)
+    time complexity: O(|L|+|R|+Q*|R|log|L|/W) where Q is the amount of queries and W the workers
+    space complexity: O(|L|+|R|) shared by every worker plus O(|L|) per worker
     """
+    network = RoadNetwork(roads)
+    return network.route_batch(queries,workers,chunksize,mode)
 
-    maximum=0
-    for road in graph:          #time comp: O(|R|) 
-        if road[0]>maximum:     #finding max
-            maximum=road[0]
-        elif road[1]>maximum:
-            maximum=road[1]
-   
-    adjacency_list=[] 
-    for i in range(maximum+1):      #time + space comp: O(|L|)
-        adjacency_list.append([])   #make empty lists within adjacency list  
-                                
-    for road in graph:          #time comp: O(|R|) 
-        vertex=road[0]          #adding edges to the list of vertices
-        el1=road[1]
-        el2=road[2]
-        el3=road[3]
-        adjacency_list[vertex].append((el1,el2,el3))
 
-    return adjacency_list
+def weight_typecode(values) -> str:
+    """
+    Function Description: picks the array typecode to hold a list of weights, 64 bit ints if every weight is an
+                          int and doubles otherwise so float times are not truncated.
+
+    @param values: iterable of the weights
+    @return: 'q' or 'd'
+
+    time complexity: O(|R|) where R is the amount of weights
+    aux space complexity: O(1)
+    """
+    for value in values:
+        if not isinstance(value, int):
+            return 'd'
+    return 'q'
+
+
+FILE_MAGIC=b"RNET"
+FILE_VERSION=1
+FILE_HEADER=struct.Struct("<4sIQQc7x")     #magic, version, n, amount of roads, weight typecode, padding to 32 bytes
+HIERARCHY_MAGIC=b"RNCH"
+HIERARCHY_VERSION=1
+HIERARCHY_HEADER=struct.Struct("<4sIQQQc7x")    #magic, version, n, amount of up edges, amount of down edges, weight typecode, padding to 40 bytes
+
+class RoadNetwork:
+    """
+    Compiled form of the roads list, built once and then reused for as many route queries as we want.
+    The roads are stored in CSR (compressed sparse row) form, so the roads leaving location u are the
+    entries offsets[u] up to offsets[u+1]-1 of targets, solo and carpool.
+
+    Attributes;
+    n: the amount of key locations
+    offsets: array of size n+1 with the start of each locations roads
+    targets: array of the location each road goes to
+    solo: array of the solo lane time of each road
+    carpool: array of the carpool lane time of each road
+    rev_offsets, rev_sources, rev_edges: CSR of the roads coming into each location, built on demand by build_reverse
+    landmark_from, landmark_to: distances from and to each landmark, built on demand by precompute_landmarks
+    max_weight: the largest road time when they are all ints, worked out on demand by integer_weight_bound
+    bucket_queues: thread local storage of the BucketQueue each thread keeps between its searches so its buckets are only
+                   made once, every thread has its own so searches on the shared network can run at the same time
+    source_path: the file the network was loaded from with load, None otherwise
+    """
+    def __init__(self, roads: list):
+        """
+        compiles the roads into the flat arrays with a counting sort on the road start
+
+        @param roads: a list of tuples (a, b, solo, carpool) representing the roads
+
+        time complexity: O(|L|+|R|) where L is the key locations (nodes) and R the roads (edges)
+        aux space complexity: O(|L|+|R|)
+        """
+        maximum=-1
+        for road in roads:              #time comp: O(|R|) finding the largest location
+            if road[0]>maximum:
+                maximum=road[0]
+            if road[1]>maximum:
+                maximum=road[1]
+        n=maximum+1
+        self.n=n
+
+        counts=[0]*(n+1)
+        for road in roads:              #count the roads leaving each location O(|R|)
+            counts[road[0]+1]+=1
+        for i in range(n):              #prefix sums give the start of each location O(|L|)
+            counts[i+1]+=counts[i]
+        self.offsets=array('q',counts)
+
+        m=len(roads)
+        typecode=weight_typecode(value for road in roads for value in road[2:4])
+        self.targets=array('q',bytes(8*m))
+        self.solo=array(typecode,bytes(8*m))
+        self.carpool=array(typecode,bytes(8*m))
+
+        position=counts[:n]                 #next free slot for each location O(|L|)
+        for road in roads:                  #place each road in its slot O(|R|)
+            k=position[road[0]]
+            position[road[0]]=k+1
+            self.targets[k]=road[1]
+            self.solo[k]=road[2]
+            self.carpool[k]=road[3]
+
+        self.rev_offsets=None
+        self.rev_sources=None
+        self.rev_edges=None
+        self.landmark_from=None
+        self.landmark_to=None
+        self.max_weight=None
+        self.bucket_queues=threading.local()
+        self.source_path=None
+
+    @classmethod
+    def from_arrays(cls, n: int, offsets, targets, solo, carpool) -> "RoadNetwork":
+        """
+        makes a RoadNetwork straight from already compiled CSR buffers (arrays, memoryviews of shared memory etc) 
+        without copying them
+
+        @param n: the amount of key locations
+        @param offsets, targets, solo, carpool: the CSR buffers as described in the class
+        @return the RoadNetwork
+
+        time complexity: O(1)
+        aux space complexity: O(1)
+        """
+        network=cls.__new__(cls)
+        network.n=n
+        network.offsets=offsets
+        network.targets=targets
+        network.solo=solo
+        network.carpool=carpool
+        network.rev_offsets=None
+        network.rev_sources=None
+        network.rev_edges=None
+        network.landmark_from=None
+        network.landmark_to=None
+        network.max_weight=None
+        network.bucket_queues=threading.local()
+        network.source_path=None
+        return network
+
+    def __getstate__(self) -> dict:
+        """
+        the state to pickle or deepcopy, without the thread local bucket queues as they can not be pickled and are only
+        a cache that each thread remakes on its first bucket search
+        """
+        state=self.__dict__.copy()
+        del state["bucket_queues"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        restores a pickled or copied network with empty bucket queues
+        """
+        self.__dict__.update(state)
+        self.bucket_queues=threading.local()
+
+    def save(self, path: str) -> None:
+        """
+        writes the compiled network to a binary file that load can memory map. the file is a 32 byte header 
+        (FILE_HEADER: magic, version, n, amount of roads, weight typecode) then offsets, targets, solo and carpool 
+        as little endian 8 byte ints (the weights as 8 byte floats when they are not ints) one after the other.
+
+        @param path: the file to write to
+
+        time complexity: O(|L|+|R|)
+        aux space complexity: O(|L|+|R|) only on big endian machines where the arrays are swapped first
+        """
+        typecode=self.solo.typecode if hasattr(self.solo,'typecode') else self.solo.format
+        with open(path,"wb") as file:
+            file.write(FILE_HEADER.pack(FILE_MAGIC,FILE_VERSION,self.n,len(self.targets),typecode.encode()))
+            for values in (self.offsets,self.targets,self.solo,self.carpool):
+                if sys.byteorder=="big":
+                    values=array(values.typecode if hasattr(values,'typecode') else values.format,values)
+                    values.byteswap()
+                file.write(memoryview(values).cast('B'))
+
+    @classmethod
+    def load(cls, path: str) -> "RoadNetwork":
+        """
+        loads a network written by save by memory mapping the file, the arrays are read straight out of the mapped pages
+        so nothing is copied and every process that loads the same file shares the same memory. the arrays are read only
+        so update_roads can not be used on it.
+
+        @param path: the file to read from
+        @return the RoadNetwork
+        @raises ValueError: if the file is not a road network file
+
+        time complexity: O(1) on little endian machines, O(|L|+|R|) on big endian ones as the arrays are swapped into copies
+        aux space complexity: O(1) on little endian machines
+        """
+        with open(path,"rb") as file:
+            mapped=mmap.mmap(file.fileno(),0,access=mmap.ACCESS_READ)
+        if len(mapped)<FILE_HEADER.size:
+            raise ValueError(path+" is not a road network file")
+        magic, version, n, m, typecode = FILE_HEADER.unpack_from(mapped,0)
+        if magic!=FILE_MAGIC or version!=FILE_VERSION:
+            raise ValueError(path+" is not a road network file")
+        typecode=typecode.decode()
+        sizes=(n+1,m,m,m)
+        typecodes=('q','q',typecode,typecode)
+        if len(mapped)!=FILE_HEADER.size+8*sum(sizes):
+            raise ValueError(path+" is truncated")
+
+        view=memoryview(mapped)
+        position=FILE_HEADER.size
+        values=[]
+        for size, code in zip(sizes,typecodes):
+            part=view[position:position+8*size].cast(code)
+            if sys.byteorder=="big":
+                part=array(code,part)
+                part.byteswap()
+            values.append(part)
+            position+=8*size
+        network=cls.from_arrays(n,*values)
+        network.source_path=path
+        return network
+
+    def to_shared_memory(self) -> tuple:
+        """
+        copies every compiled array (including the reverse CSR and landmarks if they are built) into shared memory blocks
+
+        @return a tuple of the list of SharedMemory blocks, which the caller has to close and unlink when done, and a 
+                description of them that can be sent to other processes and given to attach_shared_network
+
+        time complexity: O(|L|+|R|+K*|L|) where K is the amount of landmarks
+        aux space complexity: O(|L|+|R|+K*|L|) of shared memory
+        """
+        fields=[]
+        for name in ("offsets","targets","solo","carpool","rev_offsets","rev_sources","rev_edges"):
+            if getattr(self,name) is not None:
+                fields.append((name,None,getattr(self,name)))
+        for name in ("landmark_from","landmark_to"):
+            if getattr(self,name) is not None:
+                for i, values in enumerate(getattr(self,name)):
+                    fields.append((name,i,values))
+
+        blocks=[]
+        description=[]
+        try:
+            for name, i, values in fields:
+                data=memoryview(values).cast('B')
+                block=SharedMemory(create=True,size=max(1,len(data)))
+                blocks.append(block)
+                block.buf[:len(data)]=data
+                description.append((name,i,block.name,values.typecode if hasattr(values,'typecode') else values.format,len(values)))
+        except BaseException:
+            for block in blocks:
+                block.close()
+                block.unlink()
+            raise
+        return blocks, (self.n,description)
+
+    def route_batch(self, queries: list, workers: int = None, chunksize: int = 64, mode: str = "dijkstra") -> list:
+        """
+        answers many route queries with a pool of processes, the compiled arrays are put in shared memory once 
+        and every worker reads them in place instead of getting its own copy
+
+        @param queries: a list of (start, end, passengers) tuples
+        @param workers: the amount of processes, defaults to the amount of cpus
+        @param chunksize: how many queries are handed to a process at a time
+        @param mode: the search mode, see route
+        @return the list of paths in the same order as queries
+
+        time complexity: O(|L|+|R|+Q*|R|log|L|/W) where Q is the amount of queries and W the workers
+        aux space complexity: O(|L|+|R|) shared plus O(|L|) per worker
+        """
+        if workers is None:
+            workers=os.cpu_count() or 1
+        if mode=="alt" and self.landmark_from is None:      #build them once here rather than in every worker
+            self.precompute_landmarks()
+        if workers<=1 or len(queries)<=chunksize:
+            return [self.route(start,end,passengers,mode) for start, end, passengers in queries]
+
+        return self._pool_map(_route_worker,queries,workers,chunksize,mode)
+
+    def _pool_map(self, worker, items: list, workers: int, chunksize: int, mode: str) -> list:
+        """
+        maps worker over items with a pool of processes that all use this network without copying it, a network loaded 
+        from a file is just mapped again by each worker, otherwise the arrays are put in shared memory for them
+
+        @return the list of results in the same order as items
+
+        time complexity: O(|L|+|R|) to share the network plus the work itself
+        aux space complexity: O(|L|+|R|) shared
+        """
+        blocks=[]
+        if self.source_path is not None and self.rev_offsets is None and self.landmark_from is None:
+            description=("file",self.source_path)
+        else:
+            blocks, shared = self.to_shared_memory()
+            description=("shared",shared)
+        try:
+            with Pool(workers,initializer=_attach_worker,initargs=(description,mode)) as pool:
+                return pool.map(worker,items,chunksize)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+    def update_roads(self, changed_roads: list) -> list:
+        """
+        changes the solo and carpool times of existing roads in place, for traffic updates. this only works on networks 
+        whose arrays are writable, and the landmarks are thrown away as they may no longer be lower bounds.
+
+        @param changed_roads: a list of (a, b, solo, carpool) tuples, every road from a to b gets the new times
+        @return the list of road indices that were changed, to pass on to StandingRoute.repair
+        @raises ValueError: if there is no road from a to b, new roads need a new RoadNetwork
+        @raises TypeError: if a time is not an int on a network compiled with int times
+        every tuple is checked before anything is changed, so when one of these is raised the network is left as it was
+
+        time complexity: O(C*D) where C is the amount of changed roads and D the most roads leaving a location
+        aux space complexity: O(C)
+        """
+        typecode=self.solo.typecode if hasattr(self.solo,'typecode') else self.solo.format
+        updates=[]
+        for a, b, solo, carpool in changed_roads:  #find and check every road first O(C*D)
+            if typecode=='q' and not (isinstance(solo,int) and isinstance(carpool,int)):
+                raise TypeError("the network has int road times so the times from "+str(a)+" to "+str(b)+" have to be ints")
+            roads=[]
+            if 0<=a<self.n:
+                for k in range(self.offsets[a],self.offsets[a+1]):
+                    if self.targets[k]==b:
+                        roads.append(k)
+            if len(roads)==0:
+                raise ValueError("no road from "+str(a)+" to "+str(b))
+            updates.append((roads,solo,carpool))
+
+        changed=[]
+        for roads, solo, carpool in updates:        #then write them O(C)
+            for k in roads:
+                self.solo[k]=solo
+                self.carpool[k]=carpool
+                changed.append(k)
+        self.landmark_from=None
+        self.landmark_to=None
+        self.max_weight=None
+        self.bucket_queues=threading.local()
+        return changed
+
+    def integer_weight_bound(self):
+        """
+        the largest solo or carpool time, only when the times are ints as the bucket queue needs whole number keys
+
+        @return the largest road time or None if the times are floats
+
+        time complexity: O(|R|) the first time then O(1)
+        aux space complexity: O(1)
+        """
+        if self.max_weight is None:
+            typecode=self.solo.typecode if hasattr(self.solo,'typecode') else self.solo.format
+            if typecode!='q':
+                return None
+            self.max_weight=max(max(self.solo,default=0),max(self.carpool,default=0))
+        return self.max_weight
+
+    def search(self, source: int, passengers: list, queue: str = "heap") -> "ShortestPathTree":
+        """
+        one search from source to every location, giving the full distances and passenger_dist arrays
+
+        @param source: integer of the starting node.
+        @param passengers: the list of nodes where passengers can be picked up
+        @param queue: the priority queue to use, see layered_search
+        @return the ShortestPathTree, paths are built from it lazily
+
+        time complexity: O(|R|log|L|)
+        aux space complexity: O(|L|)
+        """
+        return ShortestPathTree(self,source,passengers,queue)
+
+    def distance_matrix(self, sources: list, passengers: list, workers: int = None, chunksize: int = 1) -> tuple:
+        """
+        the fastest times from every source to every location, each source is a separate full search and they
+        are run over a pool of processes sharing the compiled network the same as route_batch
+
+        @param sources: the list of locations to search from
+        @param passengers: the list of nodes where passengers can be picked up
+        @param workers: the amount of processes, defaults to the amount of cpus
+        @param chunksize: how many sources are handed to a process at a time
+        @return a tuple of two lists with a row per source, the distances rows and the passenger_dist rows
+
+        time complexity: O(S*|R|log|L|/W) where S is the amount of sources and W the workers
+        aux space complexity: O(S*|L|) for the output
+        """
+        if workers is None:
+            workers=os.cpu_count() or 1
+        if workers<=1 or len(sources)<=chunksize:
+            rows=[_search_rows(self,source,passengers) for source in sources]
+        else:
+            rows=self._pool_map(_search_worker,[(source,passengers) for source in sources],workers,chunksize,"dijkstra")
+        return [row[0] for row in rows], [row[1] for row in rows]
+
+    def route(self, start: int, end: int, passengers: list, mode: str = "dijkstra", queue: str = "heap") -> list:
+        """
+        finds the fastest route from start to end on the compiled network, this is the same as optimalRoute 
+        but without rebuilding the network every call
+
+        @param start: integer of the starting node.
+        @param end: integer of the ending node
+        @param passengers: the list of nodes where passengers can be picked up
+        @param mode: "dijkstra" for the plain search or "alt" for the landmark guided A* search
+        @param queue: the priority queue the dijkstra mode uses, see layered_search
+        @return the most optimal path, fastest route, from start to end
+
+        time complexity: O(|R|log|L|)
+        aux space complexity: O(|L|) only arrays the size of the locations are made per query
+        """
+        if mode=="dijkstra":
+            return dijisktra_algo(self,start,end,passengers,queue)
+        if mode=="alt":
+            if self.landmark_from is None:
+                self.precompute_landmarks()
+            return alt_algo(self,start,end,passengers)
+        raise ValueError("unknown search mode: "+str(mode))
+
+    def build_reverse(self) -> None:
+        """
+        builds the CSR of the incoming roads of every location, storing the road index into the forward arrays
+        so both directions always see the same weights
+
+        @postcondition rev_offsets, rev_sources and rev_edges are set
+
+        time complexity: O(|L|+|R|)
+        aux space complexity: O(|L|+|R|)
+        """
+        n=self.n
+        m=len(self.targets)
+        counts=[0]*(n+1)
+        for k in range(m):                  #count the roads coming into each location O(|R|)
+            counts[self.targets[k]+1]+=1
+        for i in range(n):
+            counts[i+1]+=counts[i]
+
+        rev_sources=array('q',bytes(8*m))
+        rev_edges=array('q',bytes(8*m))
+        position=counts[:n]
+        for u in range(n):                  #place each road under the location it goes to O(|L|+|R|)
+            for k in range(self.offsets[u],self.offsets[u+1]):
+                v=self.targets[k]
+                i=position[v]
+                position[v]=i+1
+                rev_sources[i]=u
+                rev_edges[i]=k
+
+        self.rev_offsets=array('q',counts)
+        self.rev_sources=rev_sources
+        self.rev_edges=rev_edges
+
+    def bound_distances(self, source: int, reverse: bool = False) -> array:
+        """
+        runs dijkstra from source using min(solo, carpool) as the weight of every road, as this is never more 
+        than what either layer pays these distances are lower bounds on the real travel times
+
+        @param source: the location to start from
+        @param reverse: if True follow the roads backwards, giving the distances from every location to source
+        @return array of the distances, inf when not reachable
+
+        time complexity: O(|R|log|L|)
+        aux space complexity: O(|L|)
+        """
+        if reverse:
+            if self.rev_offsets is None:
+                self.build_reverse()
+            offsets=self.rev_offsets
+            ends=self.rev_sources
+            edges=self.rev_edges
+        else:
+            offsets=self.offsets
+            ends=self.targets
+            edges=None
+        solo=self.solo
+        carpool=self.carpool
+
+        distances=array('d',[float("inf")])*self.n
+        distances[source]=0
+        queue=[(0,source)]
+        while len(queue)>0:
+            dist,vertex=heapq.heappop(queue)
+            if dist>distances[vertex]:
+                continue
+            for i in range(offsets[vertex],offsets[vertex+1]):
+                k=i if edges is None else edges[i]
+                weight=solo[k] if solo[k]<carpool[k] else carpool[k]
+                if dist+weight<distances[ends[i]]:
+                    distances[ends[i]]=dist+weight
+                    heapq.heappush(queue,(dist+weight,ends[i]))
+        return distances
+
+    def precompute_landmarks(self, count: int = 8) -> None:
+        """
+        picks landmarks spread out over the network and stores the lower bound distances from and to each of them,
+        these are used by alt_algo to estimate how far a location is from the end.
+        the first landmark is the location furthest from location 0, then each next one is the reachable location
+        furthest from all the landmarks already picked.
+
+        @param count: the amount of landmarks to use
+        @postcondition landmark_from and landmark_to are set
+
+        time complexity: O(K*|R|log|L|) where K is count
+        aux space complexity: O(K*|L|)
+        """
+        self.landmark_from=[]
+        self.landmark_to=[]
+        if self.n==0:
+            return
+        inf=float("inf")
+        closest=self.bound_distances(0)         #distance from the closest landmark so far
+        for _ in range(min(count,self.n)):
+            landmark=-1
+            furthest=-1
+            for v in range(self.n):             #pick the reachable location furthest from the landmarks O(|L|)
+                if closest[v]!=inf and closest[v]>furthest:
+                    furthest=closest[v]
+                    landmark=v
+            if furthest<=0 and len(self.landmark_from)>0:   #every location is already a landmark
+                break
+            self.landmark_from.append(self.bound_distances(landmark))
+            self.landmark_to.append(self.bound_distances(landmark,True))
+            for v in range(self.n):
+                if self.landmark_from[-1][v]<closest[v]:
+                    closest[v]=self.landmark_from[-1][v]
+
+def attach_shared_network(description: tuple) -> tuple:
+    """
+    Function Description: rebuilds a RoadNetwork on top of the shared memory blocks made by RoadNetwork.to_shared_memory
+                          without copying any of the arrays
+
+    @param description: the description returned by to_shared_memory
+    @return a tuple of the RoadNetwork and the list of SharedMemory blocks, which have to be kept open while it is used
+
+    time complexity: O(K) where K is the amount of blocks
+    aux space complexity: O(K)
+    """
+    n, fields = description
+    network=RoadNetwork.from_arrays(n,None,None,None,None)
+    blocks=[]
+    for name, i, block_name, typecode, length in fields:
+        block=SharedMemory(name=block_name)
+        blocks.append(block)
+        itemsize=array(typecode).itemsize
+        values=block.buf[:length*itemsize].cast(typecode)
+        if i is None:
+            setattr(network,name,values)
+        else:
+            if getattr(network,name) is None:
+                setattr(network,name,[])
+            getattr(network,name).append(values)
+    return network, blocks
+
+_worker_network=None
+_worker_blocks=None
+_worker_mode=None
+
+def _attach_worker(description: tuple, mode: str) -> None:
+    """
+    pool initializer, maps the network file or attaches the shared memory once per worker process
+    """
+    global _worker_network, _worker_blocks, _worker_mode
+    kind, data = description
+    if kind=="file":
+        _worker_network=RoadNetwork.load(data)
+        _worker_blocks=None
+    else:
+        _worker_network, _worker_blocks = attach_shared_network(data)
+    _worker_mode=mode
+
+def _search_rows(network: RoadNetwork, source: int, passengers: list) -> tuple:
+    """
+    the distances and passenger_dist rows of one source for distance_matrix
+    """
+    tree=ShortestPathTree(network,source,passengers)
+    return tree.distances, tree.passenger_dist
+
+def _search_worker(query: tuple) -> tuple:
+    """
+    answers one (source, passengers) distance_matrix row in a worker process
+    """
+    source, passengers = query
+    return _search_rows(_worker_network,source,passengers)
+
+def _route_worker(query: tuple) -> list:
+    """
+    answers one (start, end, passengers) query in a worker process
+    """
+    start, end, passengers = query
+    return _worker_network.route(start,end,passengers,_worker_mode)
+
+def passenger_flags(n: int, passengers: list) -> bytearray:
+    """
+    Function Description: marks which locations have a passenger waiting so they can be looked up in O(1)
+
+    @param n: the amount of key locations
+    @param passengers: the list of nodes where passengers can be picked up
+    @return: bytearray of size n with a 1 at every passenger location
+
+    time complexity: O(|L|+|P|)
+    aux space complexity: O(|L|)
+    """
+    pBool=bytearray(n)
+    for num in passengers:
+        if num<n:               #a passenger at a location with no roads can never be reached
+            pBool[num]=1
+    return pBool
+
+BUCKET_RATIO=256        #"auto" only uses a BucketQueue when the largest road time times this is at most the amount of locations
+
+class BucketQueue:
+    """
+    Monotone integer priority queue for Dials algorithm, a circular array of C+1 buckets where C is the largest 
+    key increase. dijkstra only ever pushes keys between the last popped key and that plus C, so each key has 
+    its own bucket and popping is just moving forward to the next bucket that is not empty.
+
+    Attributes;
+    buckets: the circular list of buckets, each a list of (key, item) 
+    current: the key of the bucket being popped from
+    size: the amount of items in the queue
+    top: the biggest key pushed, so reset only has to clear the buckets from current to it
+    """
+    def __init__(self, max_increase: int):
+        """
+        @param max_increase: the largest amount a pushed key can be above the last popped key
+
+        time complexity: O(C)
+        aux space complexity: O(C)
+        """
+        self.buckets=[[] for _ in range(max_increase+1)]
+        self.current=0
+        self.size=0
+        self.top=0
+
+    def reset(self) -> None:
+        """
+        empties the queue so the same buckets can be used by the next search instead of making new ones
+
+        time complexity: O(top-current) which is at most O(C), O(1) if it is already empty
+        """
+        if self.size>0:
+            buckets=self.buckets
+            width=len(buckets)
+            for key in range(self.current,self.top+1):
+                buckets[key%width].clear()
+        self.current=0
+        self.size=0
+        self.top=0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def push(self, item: tuple) -> None:
+        """
+        @param item: a (key, value) tuple, key can not be below the last popped key or more than C above it
+
+        time complexity: O(1)
+        """
+        self.buckets[item[0]%len(self.buckets)].append(item)
+        self.size+=1
+        if item[0]>self.top:
+            self.top=item[0]
+
+    def pop(self) -> tuple:
+        """
+        @return the (key, value) with the smallest key
 
-def dijisktra_algo(adjacency_list: list, source: int, end: int, passengers: list):
+        time complexity: O(1) amortised, the scan forward is paid for by the keys getting bigger
+        """
+        buckets=self.buckets
+        width=len(buckets)
+        while len(buckets[self.current%width])==0:
+            self.current+=1
+        self.size-=1
+        return buckets[self.current%width].pop()
+
+def dijisktra_algo(network: RoadNetwork, source: int, end: int, passengers: list, queue: str = "heap"):
     """
-    Function description: runs dijisktras algorithm to find the most efficient route from a source to a single target. takes into account the 
-    passenger and the car pool lanes too, then returns this route
+    Function description: runs dijisktras algorithm over the (location, has_passenger) states to find the most efficient route from
+    a source to a single target. takes into account the passenger and the car pool lanes too, then returns this route
 
-    @param adjacency_list: the adjacency list represnentation of the graph
+    @param network: the compiled RoadNetwork representation of the graph
     @param source: integer of the starting node.
     @param end: integer of the ending node
     @param passengers: the list of nodes where passengers can be picked up
+    @param queue: the priority queue to use, see layered_search
 
-    @return the most optimal path, fastest route, from start to end
-    time complexity: O(|L|+|P|+|L|log|L|+|P|log|L|+|R|log|L|) --> O(|R|log|L|) as R >= L-1 > P. 
+    @return the most optimal path, fastest route, from start to end or None if end can not be reached
+    time complexity: O(|L|+|P|+|R|log|L|) --> O(|R|log|L|) as R >= L-1 > P. 
                                                          Where L is key locations and P passenger list and R the roads
 
     aux space complexity: O(|L|+|P|) -> O(|L|)  where L is the key locations, P the passenger list 
     """
-    n=len(adjacency_list)
-    distances = [None] * n
-    pBool=[False] *n
-    passenger_dist=[None] *n
-    pred=[None]*n
-    pred_passeng=[None]*n
-                                #initialise the lists of size O(|L|) (nodes)
-                                #space_comp=O(|L|)
-    
-    for i in range(n):          #space: O(2*|L|)->O(|L|) L is key locations (nodes)
-        inf=float("inf")        #time: O(|L|)
-        distances[i]=inf
-        passenger_dist[i]=inf
-  
-    for num in passengers:      #space: O(|P|) P is array of passengers
-        pBool[num]=True         #time: O(|P|)
-
-    distances[source]=0
-    
-    queue=[(0,source,pBool[source])]        #distance,vertex,has_passenger stored within each queue item
-                                            # in this queue item the max length will be O(1)*C
+    if source==end:
+        return [source]
+
+    pBool=passenger_flags(network.n,passengers)
+    distances, pred, state = layered_search(network,source,pBool,end,queue)   #time: O(|R|log|L|) space: O(|L|)
+    if state==-1:
+        return None
+    return traceback(pred,state,network.n)
+
+def layered_search(network: RoadNetwork, source: int, pBool: bytearray, end: int = -1, queue: str = "heap") -> tuple:
+    """
+    Function description: the dijkstra over the (location, has_passenger) states, state id is location + has_passenger*n.
+    stops as soon as a state of end is settled, or settles everything reachable when end is -1.
+    with whole number road times the keys only ever go up by at most the largest time C, so a BucketQueue (Dials algorithm)
+    can be used instead of the heap, making every push and pop O(1) amortised instead of O(log|L|).
+
+    @param network: the compiled RoadNetwork representation of the graph
+    @param source: integer of the starting node.
+    @param pBool: the passenger flags from passenger_flags
+    @param end: integer of the ending node, or -1 to search the whole network
+    @param queue: "heap", "bucket" or "auto", which uses buckets only when the times are ints and the largest is small 
+                  next to the amount of locations (see BUCKET_RATIO), as every empty bucket between two keys is scanned
+
+    @return a tuple of the distances and predecessor arrays over the 2|L| states and the end state settled, -1 if none
+    time complexity: O(|R|log|L|) with the heap, O(|R|+D) with buckets where D is the distance to the last state settled
+    aux space complexity: O(|L|) with the heap, O(|L|+C) with buckets
+    """
+    n=network.n
+    offsets=network.offsets
+    targets=network.targets
+    solo=network.solo
+    carpool=network.carpool
 
-    ##Loops over the length of queue and pops each time which will be O(|L|log|L|) 
+    inf=float("inf")
+    distances=[inf]*(2*n)           #state id is location + has_passenger*n, space: O(|L|)
+    pred=[-1]*(2*n)                 #single predecessor array over the states
+
+    first=source+n if pBool[source] else source     #picking up at the start puts us straight in the passenger layer
+    distances[first]=0
+
+    bound=network.integer_weight_bound() if queue!="heap" else None
+    if queue=="bucket" and bound is None:
+        raise ValueError("the bucket queue needs integer road times")
+    if queue not in ("heap","bucket","auto"):
+        raise ValueError("unknown queue: "+str(queue))
+    if bound is not None and (queue=="bucket" or bound*BUCKET_RATIO<=n):
+        queue=getattr(network.bucket_queues,"queue",None)      #this threads own queue so searches stay reentrant
+        if queue is None or len(queue.buckets)!=bound+1:
+            queue=network.bucket_queues.queue=BucketQueue(bound)
+        queue.reset()
+        push=queue.push
+        pop=queue.pop
+    else:
+        queue=[]
+        push=partial(heapq.heappush,queue)
+        pop=partial(heapq.heappop,queue)
+    push((0,first))
+
+    ##every state is settled once and each road relaxed at most once per layer so O(|R|log|L|)
     while len(queue)>0:
 
-        dist, vertex, has_passenger = heapq.heappop(queue)  #pop is O(log(|L|)) 
-        
-        if vertex==end:
-            continue              
-        # if it is at end then dip
-            
-        if dist<distances[vertex] and not has_passenger :
+        dist, state = pop()                     #pop is O(log(|L|)), O(1) amortised for buckets
+        if dist>distances[state]:               #if its an old value then get rid of it
             continue
-        #if its an old value then get rid of it unless it is involved in a passenger calc
-        
-            
-        if pBool[vertex]:       #check if it has a passenger and store where we picked it
-            has_passenger=True
-            picked_index=vertex 
-        
-        for next_node, single_weight, pass_weight in adjacency_list[vertex]:        #loop TOTALS at all edges and whenever it adds a passenger so is of O(|R|+|P|) |P|<|R| and pushes to queue therefore O(|R|log|L|)
-            if has_passenger:
-                if dist+pass_weight<distances[next_node]: 
-                    
-                    try:                                                    #try update the index to the one from before in passenger 
-                        if pred_passeng[vertex][1] is not None:             #if not then just use the new one as this is first pick up
-                            picked_index=pred_passeng[vertex][1]
-                    except TypeError:
-                        pass
-
-                    pred_passeng[next_node]=(vertex,picked_index)           #update passenger predecessors with the index of pick up aswell
-                    distances[next_node]=dist+pass_weight                   #relax node
-                    passenger_dist[next_node]=dist+pass_weight
-
-                    heapq.heappush(queue,(distances[next_node],next_node,has_passenger))       #PUSH OPERATIONS ARE O(log(|L|))
-                
-                elif dist+pass_weight<passenger_dist[next_node]:
-                    
-                    try:                                                    #try update the index to the one from before in passenger 
-                        if pred_passeng[vertex][1] is not None:             #if not then just use the new one as this is first pick up
-                            picked_index=pred_passeng[vertex][1]
-                    except TypeError:
-                        pass
-
-                    pred_passeng[next_node]=(vertex,picked_index)           #update passenger predecessors with index of pick up aswell
-                    passenger_dist[next_node]=dist+pass_weight              #relax node
-                    
-                    
-                    heapq.heappush(queue,(passenger_dist[next_node],next_node,has_passenger))  #PUSH OPERATIONS ARE O(log(|L|))
-            
+
+        if state<n:
+            vertex=state
+        else:
+            vertex=state-n
+        if vertex==end:                         #first settled end state is the fastest, stop here
+            return distances, pred, state
+
+        for k in range(offsets[vertex],offsets[vertex+1]):
+            next_node=targets[k]
+            if state>=n:                        #already have a passenger so take the carpool lane
+                next_state=next_node+n
+                new_dist=dist+carpool[k]
             else:
-                if dist+single_weight<=distances[next_node]:            #if improves distance estimate
-                    
-                    distances[next_node]=dist+single_weight             #relax node
-                    pred[next_node]=vertex                              #update pred
-                    heapq.heappush(queue,(distances[next_node],next_node,False))   #PUSH OPERATIONS ARE O(log(|L|))
-        
-    
-    #let me know if any passengers here
-    if len(passengers)==0:  
-        pass_bool=False
-    else: 
-        pass_bool=True
-
-    #check if passenger route is faster
-    skip_pass=False
-    if passenger_dist[end]>distances[end]:
-        skip_pass=True
-   
-    #call traceback method to get the route, time and space O(|L|) 
-    path=traceback(pred,pred_passeng,end,source,pass_bool,skip_pass)
+                new_dist=dist+solo[k]
+                if pBool[next_node]:            #pick up the passenger when we get there
+                    next_state=next_node+n
+                else:
+                    next_state=next_node
+            if new_dist<distances[next_state]:  #relax the state
+                distances[next_state]=new_dist
+                pred[next_state]=state
+                push((new_dist,next_state))     #PUSH OPERATIONS ARE O(log(|L|)), O(1) for buckets
+
+    return distances, pred, -1
+
+def benchmark_queues(network: RoadNetwork, queries: list, repeat: int = 3) -> dict:
+    """
+    Function description: times the same route queries with the heap and with the bucket queue, to check whether buckets 
+    pay off for a network before choosing them. each queue is timed repeat times and the best run is kept.
 
-    return path
+    @param network: the compiled RoadNetwork, its road times have to be ints for the bucket queue
+    @param queries: a list of (start, end, passengers) tuples
+    @param repeat: how many times to run all the queries with each queue
+    @return a dictionary of the milliseconds per query for "heap" and "bucket"
+
+    time complexity: O(repeat*Q*|R|log|L|) where Q is the amount of queries
+    aux space complexity: O(|L|+C)
+    """
+    results={}
+    for queue in ("heap","bucket"):
+        best=float("inf")
+        for _ in range(repeat):
+            begin=time.perf_counter()
+            for start, end, passengers in queries:
+                dijisktra_algo(network,start,end,passengers,queue)
+            best=min(best,time.perf_counter()-begin)
+        results[queue]=best*1000/max(1,len(queries))
+    return results
     
-def traceback(preds:list, preds_passen:list, n:int, start:int ,passengers:bool, skip_pass:bool)->list:
+def alt_algo(network: RoadNetwork, source: int, end: int, passengers: list):
+    """
+    Function description: A* search over the same (location, has_passenger) states as dijisktra_algo, guided by the landmark 
+    lower bounds (ALT). by the triangle inequality d(v,end) >= d(v,L)-d(end,L) and d(v,end) >= d(L,end)-d(L,v) for every landmark L, 
+    and as the landmark distances use the cheaper of the two lanes they hold in both layers, so the estimate never overestimates
+    and stays consistent. This means the first end state popped is still the fastest, but far fewer states get settled as the 
+    search is pulled towards end instead of growing in every direction.
+
+    @param network: the compiled RoadNetwork with precompute_landmarks already run
+    @param source: integer of the starting node.
+    @param end: integer of the ending node
+    @param passengers: the list of nodes where passengers can be picked up
+
+    @return a fastest path from start to end, of the same total time as dijisktra_algo, or None if end can not be reached
+    time complexity: O(K*|L|+|R|log|L|) worst case where K is the amount of landmarks, usually much less as few states are settled
+    aux space complexity: O(|L|)
     """
-    Function Description: returns an array of the shortest path, searching through the predecessors arrays
+    if source==end:
+        return [source]
+
+    n=network.n
+    offsets=network.offsets
+    targets=network.targets
+    solo=network.solo
+    carpool=network.carpool
+    pBool=passenger_flags(n,passengers)
+    landmark_pairs=list(zip(network.landmark_from,network.landmark_to))
+
+    inf=float("inf")
+    estimates=[None]*n                  #lower bound from each location to end, worked out the first time it is needed
+    def estimate(v):
+        if estimates[v] is None:
+            best=0
+            for from_landmark, to_landmark in landmark_pairs:
+                if to_landmark[v]!=inf and to_landmark[end]!=inf:
+                    best=max(best,to_landmark[v]-to_landmark[end])
+                elif to_landmark[end]!=inf:             #end reaches the landmark but v cant so v cant reach end
+                    best=inf
+                    break
+                if from_landmark[end]!=inf and from_landmark[v]!=inf:
+                    best=max(best,from_landmark[end]-from_landmark[v])
+                elif from_landmark[v]!=inf:             #the landmark reaches v but not end so v cant reach end
+                    best=inf
+                    break
+            estimates[v]=best
+        return estimates[v]
+
+    distances=[inf]*(2*n)
+    pred=[-1]*(2*n)
+    first=source+n if pBool[source] else source
+    distances[first]=0
+    queue=[(estimate(source),0,first)]
+
+    while len(queue)>0:
+        _, dist, state = heapq.heappop(queue)
+        if dist>distances[state]:
+            continue
+
+        if state<n:
+            vertex=state
+        else:
+            vertex=state-n
+        if vertex==end:
+            return traceback(pred,state,n)
+
+        for k in range(offsets[vertex],offsets[vertex+1]):
+            next_node=targets[k]
+            if state>=n:
+                next_state=next_node+n
+                new_dist=dist+carpool[k]
+            else:
+                new_dist=dist+solo[k]
+                if pBool[next_node]:
+                    next_state=next_node+n
+                else:
+                    next_state=next_node
+            if new_dist<distances[next_state]:
+                bound=estimate(next_node)
+                if bound==inf:                  #no point going somewhere that cant reach end
+                    continue
+                distances[next_state]=new_dist
+                pred[next_state]=state
+                heapq.heappush(queue,(new_dist+bound,new_dist,next_state))
+
+    return None
     
-    @param preds: an array of predecessors to non passenger ways
-    @param preds_passen: an array of predecessors and pickup locations for when a passenger is in
-    @param n: the integer index of the final node
-    @param start: the integer index of start node
-    @param passengers: bool of if there is a passenger
-    @paran skip_pass: bool which is true if you should skip the passenger
+def traceback(preds:list, state:int, n:int)->list:
+    """
+    Function Description: returns an array of the shortest path, following the predecessor states back from the final state
+
+    @param preds: an array of predecessor states, -1 for the starting state
+    @param state: the state id of the final node
+    @param n: the amount of key locations, used to turn state ids back into locations
     @return: a list of the full path till the final node with the shortest distance
     
     time complexity: O(|L|) where L is the key locations
     aux space complexity: O(|L|) where L is the key locations 
     """
-    
-    ouptut_path=[n]
-    if not skip_pass:           #skip if without passengers is faster
-        try:                                            #ensures that we only care about passengers that are in our route and ignores those out of bounds
-            if passengers:                              #only runs if there is a passenger route:
-                while preds_passen[n][0] is not None and n!=preds_passen[n][1]:   #backtracks until we find where the passenger hops on or until we reached source
-                    ouptut_path.append(preds_passen[n][0])
-                    n=preds_passen[n][0]                             
-        except TypeError:
-            pass
-    
-    while preds[n] is not None and preds[n]!=start:       #backtracks the other predecessors nodes from before we picked up passenger if necessary
-        ouptut_path.append(preds[n])
-        n=preds[n]    
-
-    if ouptut_path[-1]!=start:                  
-        ouptut_path.append(start)               
+    output_path=[]
+    while state!=-1:                    #backtracks till the starting state
+        output_path.append(state%n)
+        state=preds[state]
    
-    ouptut_path.reverse()                       # reverses list O(|L|)
+    output_path.reverse()               # reverses list O(|L|)
+
+    return output_path
+
+
+class ShortestPathTree:
+    """
+    The result of one search from a source to every location, with the paths only built when asked for.
+
+    Attributes;
+    n: the amount of key locations
+    source: the location searched from
+    distances: array of the fastest time to every location without having picked up a passenger, inf if not possible
+    passenger_dist: array of the fastest time to every location with a passenger, inf if not possible
+    pred: the predecessor states of the search, see layered_search
+    """
+    def __init__(self, network: RoadNetwork, source: int, passengers: list, queue: str = "heap"):
+        """
+        runs the full search from source
+
+        @param network: the compiled RoadNetwork
+        @param source: integer of the starting node.
+        @param passengers: the list of nodes where passengers can be picked up
+        @param queue: the priority queue to use, see layered_search
+
+        time complexity: O(|R|log|L|)
+        aux space complexity: O(|L|)
+        """
+        n=network.n
+        self.n=n
+        self.source=source
+        distances, self.pred, _ = layered_search(network,source,passenger_flags(n,passengers),-1,queue)
+        self.distances=array('d',distances[:n])
+        self.passenger_dist=array('d',distances[n:])
+
+    def time(self, target: int) -> float:
+        """
+        @param target: the location to get to
+        @return the fastest time to target with or without a passenger
+
+        time complexity: O(1)
+        """
+        return min(self.distances[target],self.passenger_dist[target])
+
+    def path(self, target: int, with_passenger: bool = None) -> list:
+        """
+        builds the path to target from the stored predecessors
+
+        @param target: the location to get to
+        @param with_passenger: True or False to get the path in that layer, None for whichever is faster
+        @return the path from source to target or None if it can not be reached that way
 
-    return ouptut_path
+        time complexity: O(|L|)
+        aux space complexity: O(|L|)
+        """
+        if with_passenger is None:
+            with_passenger=self.passenger_dist[target]<=self.distances[target]
+        if with_passenger:
+            state=target+self.n
+            dist=self.passenger_dist[target]
+        else:
+            state=target
+            dist=self.distances[target]
+        if dist==float("inf"):
+            return None
+        return traceback(self.pred,state,self.n)
 
 
-def select_sections(occupancy_probability: list[list]) -> list:
+class StandingRoute:
+    """
+    A route query that is kept up to date as road times change, using lifelong planning A* (LPA*) with no heuristic
+    over the (location, has_passenger) states. g is the current distance of each state and rhs the one step lookahead
+    from its predecessors, a state is only reprocessed when the two disagree, so after a change only the part of the 
+    search that the change actually affects is repaired instead of searching again from scratch.
+    all the end states lead into one extra goal state with 0 cost, so the best of both layers is the goal.
+    LPA* needs every edge to cost more than 0, else a cycle of 0 time roads keeps its states consistent at an old
+    distance after a road into it gets slower. so every distance is a (time, roads) pair compared in that order, 
+    each road adds 1 to the second part, this keeps the fastest time and makes every edge cost strictly more than 0.
+
+    Attributes;
+    network: the RoadNetwork, its reverse CSR is built if it was not already
+    start: the starting location
+    end: the ending location
+    pBool: the passenger flags
+    first: the starting state
+    goal: the id of the extra goal state, 2n
+    g: list of the (time, roads) distance of each state
+    rhs: list of the (time, roads) lookahead distance of each state
+    queue: heap of (key, state) with old entries left in it
+    open_key: dictionary of the current key of every state that is in the queue
+    """
+    def __init__(self, network: RoadNetwork, start: int, end: int, passengers: list):
+        """
+        sets up the query and runs the first search
+
+        @param network: the compiled RoadNetwork
+        @param start: integer of the starting node.
+        @param end: integer of the ending node
+        @param passengers: the list of nodes where passengers can be picked up
+
+        time complexity: O(|R|log|L|) for the first search
+        aux space complexity: O(|L|)
+        """
+        if network.rev_offsets is None:
+            network.build_reverse()
+        n=network.n
+        self.network=network
+        self.start=start
+        self.end=end
+        self.pBool=passenger_flags(n,passengers)
+        self.first=start+n if self.pBool[start] else start
+        self.goal=2*n
+        inf=(float("inf"),0)
+        self.g=[inf]*(2*n+1)
+        self.rhs=[inf]*(2*n+1)
+        self.queue=[]
+        self.open_key={}
+        self.rhs[self.first]=(0,0)
+        self._push(self.first)
+        self._compute()
+
+    def _push(self, state: int) -> None:
+        """
+        puts state in the queue with its current key, min(g, rhs)
+
+        time complexity: O(log|L|)
+        """
+        key=min(self.g[state],self.rhs[state])
+        self.open_key[state]=key
+        heapq.heappush(self.queue,(key,state))
+
+    def _top_key(self) -> tuple:
+        """
+        the smallest key still in the queue, dropping old entries on the way
+
+        time complexity: O(log|L|) amortised
+        """
+        while len(self.queue)>0:
+            key, state = self.queue[0]
+            if self.open_key.get(state)==key:
+                return key
+            heapq.heappop(self.queue)
+        return (float("inf"),0)
+
+    def _predecessors(self, state: int):
+        """
+        yields (previous state, cost) for every edge coming into state
+
+        time complexity: O(D) where D is the amount of roads into the location
+        """
+        network=self.network
+        n=network.n
+        if state==self.goal:
+            yield self.end, 0
+            yield self.end+n, 0
+            return
+        vertex=state if state<n else state-n
+        if state<n and self.pBool[vertex]:      #the solo state of a passenger location is never used
+            return
+        for i in range(network.rev_offsets[vertex],network.rev_offsets[vertex+1]):
+            k=network.rev_edges[i]
+            source=network.rev_sources[i]
+            if state>=n:
+                yield source+n, network.carpool[k]
+                if self.pBool[vertex]:          #arrived alone and picked the passenger up here
+                    yield source, network.solo[k]
+            else:
+                yield source, network.solo[k]
+
+    def _successors(self, state: int):
+        """
+        yields every state that has an edge coming from state
+
+        time complexity: O(D) where D is the amount of roads leaving the location
+        """
+        network=self.network
+        n=network.n
+        if state==self.goal:
+            return
+        vertex=state if state<n else state-n
+        if vertex==self.end:
+            yield self.goal
+        for k in range(network.offsets[vertex],network.offsets[vertex+1]):
+            next_node=network.targets[k]
+            if state>=n or self.pBool[next_node]:
+                yield next_node+n
+            else:
+                yield next_node
+
+    def _update_state(self, state: int) -> None:
+        """
+        recomputes rhs of state from its predecessors and puts it in or takes it out of the queue
+
+        time complexity: O(D+log|L|)
+        """
+        if state!=self.first:
+            best=(float("inf"),0)
+            for previous, weight in self._predecessors(state):
+                distance=self.g[previous]
+                if distance[0]+weight<best[0] or (distance[0]+weight==best[0] and distance[1]+1<best[1]):
+                    best=(distance[0]+weight,distance[1]+1)
+            self.rhs[state]=best
+        if self.g[state]!=self.rhs[state]:
+            self._push(state)
+        else:
+            self.open_key.pop(state,None)
+
+    def _compute(self) -> None:
+        """
+        processes the inconsistent states in key order until the goal is consistent and nothing as cheap is left,
+        states tied with the goal are processed too as the end states reach the goal with 0 cost
+
+        time complexity: O(A*D*log|L|) where A is the amount of states whose distance changed
+        """
+        goal=self.goal
+        while self._top_key()<=min(self.g[goal],self.rhs[goal]) or self.g[goal]!=self.rhs[goal]:
+            if len(self.queue)==0:
+                break
+            _, state = heapq.heappop(self.queue)
+            del self.open_key[state]
+            if self.g[state]>self.rhs[state]:       #got cheaper, settle it
+                self.g[state]=self.rhs[state]
+                for next_state in self._successors(state):
+                    self._update_state(next_state)
+            else:                                   #got more expensive, reset it and everything it fed
+                self.g[state]=(float("inf"),0)
+                self._update_state(state)
+                for next_state in self._successors(state):
+                    self._update_state(next_state)
+
+    def repair(self, changed: list) -> list:
+        """
+        repairs the search after the roads with the given indices changed times
+
+        @param changed: list of road indices, as returned by RoadNetwork.update_roads
+        @return the new fastest path
+
+        time complexity: proportional to the states whose distance changed, O(|R|log|L|) worst case
+        aux space complexity: O(|L|)
+        """
+        n=self.network.n
+        for k in changed:
+            next_node=self.network.targets[k]
+            self._update_state(next_node+n)
+            if not self.pBool[next_node]:
+                self._update_state(next_node)
+        self._compute()
+        return self.path()
+
+    def update(self, changed_roads: list) -> list:
+        """
+        changes the road times on the network and repairs this route, use update_roads and repair directly 
+        when several standing routes share the network
+
+        @param changed_roads: a list of (a, b, solo, carpool) tuples
+        @return the new fastest path
+
+        time complexity: proportional to the states whose distance changed
+        """
+        return self.repair(self.network.update_roads(changed_roads))
+
+    def time(self) -> float:
+        """
+        @return the time of the current fastest path, inf if end can not be reached
+        """
+        return self.g[self.goal][0]
+
+    def path(self) -> list:
+        """
+        builds the current fastest path by going back from the goal through the predecessor with the best g + cost,
+        only predecessors strictly closer to the start are used so this always stops
+
+        @return the path from start to end or None if end can not be reached
+
+        time complexity: O(|L|*D)
+        aux space complexity: O(|L|)
+        """
+        if self.start==self.end:
+            return [self.start]
+        if self.g[self.goal][0]==float("inf"):
+            return None
+        n=self.network.n
+        state=self.goal
+        output_path=[]
+        while state!=self.first:
+            best=None
+            best_dist=(float("inf"),0)
+            for previous, weight in self._predecessors(state):
+                distance=self.g[previous]
+                candidate=(distance[0]+weight,distance[1]+1)
+                if distance<self.g[state] and candidate<best_dist:
+                    best_dist=candidate
+                    best=previous
+            if best is None:
+                return None
+            state=best
+            output_path.append(state%n)
+        output_path.reverse()
+        return output_path
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy over the (location, has_passenger) states of a RoadNetwork for a fixed list of passengers,
+    picking up a passenger is the move from the solo layer into the carpool layer the same as in dijisktra_algo.
+    States are contracted one at a time from least to most important, adding shortcut edges wherever removing a state
+    would break a shortest path, so a query only ever has to go up in rank from both ends and meet in the middle.
+
+    Attributes;
+    n: the amount of key locations, states are 0 to 2n-1
+    pBool: bytearray of the passenger locations the hierarchy was built for
+    rank: array of the contraction order of every state
+    up_offsets, up_targets, up_weights, up_middle: CSR of the edges from each state to higher ranked states
+    down_offsets, down_sources, down_weights, down_middle: CSR of the edges coming into each state from higher ranked states
+    the middle arrays hold the state a shortcut skips over, or -1 for a real road
+    """
+    def __init__(self, network: RoadNetwork, passengers: list, witness_limit: int = 200):
+        """
+        builds the hierarchy, this is the slow offline step and the result can be kept with save
+
+        @param network: the compiled RoadNetwork
+        @param passengers: the list of nodes where passengers can be picked up
+        @param witness_limit: the most states a witness search settles before giving up and adding the shortcut
+
+        time complexity: O(|L|*W*log W + |R|) roughly, where W is witness_limit, it depends heavily on the road layout
+        aux space complexity: O(|L|+|R|+S) where S is the amount of shortcuts
+        """
+        n=network.n
+        self.n=n
+        self.pBool=passenger_flags(n,passengers)
+        states=2*n
+
+        out_edges=[{} for _ in range(states)]       #state -> {next state: [weight, middle]}
+        in_edges=[{} for _ in range(states)]
+        for vertex in range(n):
+            for k in range(network.offsets[vertex],network.offsets[vertex+1]):
+                next_node=network.targets[k]
+                if not self.pBool[vertex]:          #solo layer, a passenger location is never in it
+                    next_state=next_node+n if self.pBool[next_node] else next_node
+                    self._add_edge(out_edges,in_edges,vertex,next_state,network.solo[k],-1)
+                self._add_edge(out_edges,in_edges,vertex+n,next_node+n,network.carpool[k],-1)
+
+        contracted=bytearray(states)
+        deleted_neighbours=[0]*states
+        rank=array('q',bytes(8*states))
+        queue=[]
+        for state in range(states):
+            heapq.heappush(queue,(self._priority(out_edges,in_edges,contracted,deleted_neighbours,state,witness_limit),state))
+
+        order=0
+        while len(queue)>0:                 #lazy updates, only contract if it is still the least important
+            _, state = heapq.heappop(queue)
+            if contracted[state]:
+                continue
+            priority=self._priority(out_edges,in_edges,contracted,deleted_neighbours,state,witness_limit)
+            if len(queue)>0 and priority>queue[0][0]:
+                heapq.heappush(queue,(priority,state))
+                continue
+            for source, target, weight in self._shortcuts(out_edges,in_edges,contracted,state,witness_limit):
+                self._add_edge(out_edges,in_edges,source,target,weight,state)
+            contracted[state]=1
+            rank[state]=order
+            order+=1
+            for neighbour in out_edges[state]:
+                deleted_neighbours[neighbour]+=1
+            for neighbour in in_edges[state]:
+                deleted_neighbours[neighbour]+=1
+        self.rank=rank
+
+        up=[[] for _ in range(states)]
+        down=[[] for _ in range(states)]
+        for source in range(states):        #split every road and shortcut by which way it goes in rank
+            for target, (weight, middle) in out_edges[source].items():
+                if rank[source]<rank[target]:
+                    up[source].append((target,weight,middle))
+                else:
+                    down[target].append((source,weight,middle))
+        typecode=network.solo.typecode if hasattr(network.solo,'typecode') else network.solo.format
+        self.up_offsets, self.up_targets, self.up_weights, self.up_middle = self._flatten(up,typecode)
+        self.down_offsets, self.down_sources, self.down_weights, self.down_middle = self._flatten(down,typecode)
+
+    @staticmethod
+    def _add_edge(out_edges: list, in_edges: list, source: int, target: int, weight, middle: int) -> None:
+        """
+        adds an edge, only keeping the cheapest when there is already one between the same states
+
+        time complexity: O(1)
+        aux space complexity: O(1)
+        """
+        if source==target:
+            return
+        current=out_edges[source].get(target)
+        if current is None or weight<current[0]:
+            out_edges[source][target]=[weight,middle]
+            in_edges[target][source]=[weight,middle]
+
+    @staticmethod
+    def _shortcuts(out_edges: list, in_edges: list, contracted: bytearray, state: int, witness_limit: int) -> list:
+        """
+        finds the shortcuts needed to contract state, one for every pair of neighbours whose only shortest path goes 
+        through state, checked with a limited dijkstra (witness search) that avoids state
+
+        @return a list of (source, target, weight) shortcuts
+
+        time complexity: O(D*W*log W) where D is the degree of the state and W the witness_limit
+        aux space complexity: O(W)
+        """
+        shortcuts=[]
+        outgoing=[(target,edge[0]) for target, edge in out_edges[state].items() if not contracted[target]]
+        if len(outgoing)==0:
+            return shortcuts
+        longest=max(weight for _, weight in outgoing)
+        inf=float("inf")
+        for source, edge in in_edges[state].items():
+            if contracted[source]:
+                continue
+            to_state=edge[0]
+            limit=to_state+longest
+            distances={source:0}
+            queue=[(0,source)]
+            settled=0
+            while len(queue)>0 and settled<witness_limit:
+                dist, vertex = heapq.heappop(queue)
+                if dist>distances[vertex]:
+                    continue
+                if dist>limit:
+                    break
+                settled+=1
+                for next_state, next_edge in out_edges[vertex].items():
+                    if next_state==state or contracted[next_state]:
+                        continue
+                    new_dist=dist+next_edge[0]
+                    if new_dist<distances.get(next_state,inf):
+                        distances[next_state]=new_dist
+                        heapq.heappush(queue,(new_dist,next_state))
+            for target, weight in outgoing:
+                if target!=source and distances.get(target,inf)>to_state+weight:     #no witness so the shortcut is needed
+                    shortcuts.append((source,target,to_state+weight))
+        return shortcuts
+
+    @classmethod
+    def _priority(cls, out_edges: list, in_edges: list, contracted: bytearray, deleted_neighbours: list, state: int, witness_limit: int) -> int:
+        """
+        importance of a state, the edge difference (shortcuts added minus edges removed) plus how many of its neighbours are 
+        already contracted so the contraction stays spread out over the network
+
+        time complexity: O(D*W*log W)
+        aux space complexity: O(W)
+        """
+        shortcuts=len(cls._shortcuts(out_edges,in_edges,contracted,state,witness_limit))
+        return shortcuts-len(out_edges[state])-len(in_edges[state])+deleted_neighbours[state]
+
+    @staticmethod
+    def _flatten(edges: list, typecode: str) -> tuple:
+        """
+        turns a list of edge lists into CSR arrays
+
+        @return a tuple of the offsets, other end, weight and middle arrays
+
+        time complexity: O(|L|+|R|+S)
+        aux space complexity: O(|L|+|R|+S)
+        """
+        offsets=array('q',[0])
+        ends=array('q')
+        weights=array(typecode)
+        middles=array('q')
+        for state_edges in edges:
+            for end, weight, middle in state_edges:
+                ends.append(end)
+                weights.append(weight)
+                middles.append(middle)
+            offsets.append(len(ends))
+        return offsets, ends, weights, middles
+
+    def _upward(self, firsts: list, offsets: array, ends: array, weights: array, 
+                stall_offsets: array, stall_ends: array, stall_weights: array) -> tuple:
+        """
+        dijkstra from the given states that only follows edges up in rank, with stall on demand, if a higher ranked state
+        already reached reaches this state cheaper through an edge the other way then this state cant be on a shortest path
+        so its edges are not relaxed
+
+        @return dictionaries of the distance and predecessor edge index of every state reached
+
+        time complexity: O(U log U) where U is the size of the upward search space, usually tiny
+        aux space complexity: O(U)
+        """
+        distances={}
+        preds={}
+        queue=[]
+        for first in firsts:
+            distances[first]=0
+            preds[first]=-1
+            queue.append((0,first))
+        heapq.heapify(queue)
+        while len(queue)>0:
+            dist, state = heapq.heappop(queue)
+            if dist>distances[state]:
+                continue
+            stalled=False
+            for i in range(stall_offsets[state],stall_offsets[state+1]):
+                other=stall_ends[i]
+                if other in distances and distances[other]+stall_weights[i]<dist:
+                    stalled=True
+                    break
+            if stalled:
+                continue
+            for i in range(offsets[state],offsets[state+1]):
+                next_state=ends[i]
+                new_dist=dist+weights[i]
+                if next_state not in distances or new_dist<distances[next_state]:
+                    distances[next_state]=new_dist
+                    preds[next_state]=i
+                    heapq.heappush(queue,(new_dist,next_state))
+        return distances, preds
+
+    def _unpack(self, source: int, target: int, middle: int, path: list) -> None:
+        """
+        appends the states of the edge source -> target to path, without source, expanding shortcuts recursively.
+        the middle state is ranked below both ends so source -> middle is a down edge of middle and middle -> target an up edge
+
+        time complexity: O(P*D) where P is the amount of roads the edge stands for and D the largest degree
+        aux space complexity: O(P)
+        """
+        if middle==-1:
+            path.append(target)
+            return
+        for i in range(self.down_offsets[middle],self.down_offsets[middle+1]):
+            if self.down_sources[i]==source:
+                self._unpack(source,middle,self.down_middle[i],path)
+                break
+        for i in range(self.up_offsets[middle],self.up_offsets[middle+1]):
+            if self.up_targets[i]==target:
+                self._unpack(middle,target,self.up_middle[i],path)
+                break
+
+    def route(self, start: int, end: int) -> list:
+        """
+        finds the fastest route from start to end for the passengers the hierarchy was built for,
+        searching upwards from start and (backwards) from both end states then taking the best meeting state.
+
+        @param start: integer of the starting node.
+        @param end: integer of the ending node
+        @return the most optimal path, fastest route, from start to end or None if end can not be reached
+
+        time complexity: O(U log U + P*D) where U is the upward search spaces and P the length of the path
+        aux space complexity: O(U+P)
+        """
+        if start==end:
+            return [start]
+        n=self.n
+        first=start+n if self.pBool[start] else start
+        lasts=[end+n]
+        if not self.pBool[end]:
+            lasts.append(end)
+        forward, forward_preds = self._upward([first],self.up_offsets,self.up_targets,self.up_weights,
+                                              self.down_offsets,self.down_sources,self.down_weights)
+        backward, backward_preds = self._upward(lasts,self.down_offsets,self.down_sources,self.down_weights,
+                                                self.up_offsets,self.up_targets,self.up_weights)
+
+        meet=-1
+        best=float("inf")
+        for state, dist in forward.items():         #best meeting state of the two searches
+            if state in backward and dist+backward[state]<best:
+                best=dist+backward[state]
+                meet=state
+        if meet==-1:
+            return None
+
+        chain=[]                                    #up edges from first to meet
+        state=meet
+        while forward_preds[state]!=-1:
+            i=forward_preds[state]
+            chain.append(i)
+            state=self._up_source(i)
+        path=[first]
+        for i in reversed(chain):
+            self._unpack(path[-1],self.up_targets[i],self.up_middle[i],path)
+        state=meet
+        while backward_preds[state]!=-1:            #down edges from meet to the end state
+            i=backward_preds[state]
+            target=self._down_target(i)
+            self._unpack(state,target,self.down_middle[i],path)
+            state=target
+        return [state%n for state in path]
+
+    def _up_source(self, i: int) -> int:
+        """
+        the state an up edge leaves from, found by binary search on up_offsets
+
+        time complexity: O(log|L|)
+        """
+        low=0
+        high=2*self.n-1
+        while low<high:
+            mid=(low+high+1)//2
+            if self.up_offsets[mid]<=i:
+                low=mid
+            else:
+                high=mid-1
+        return low
+
+    def _down_target(self, i: int) -> int:
+        """
+        the state a down edge goes into, found by binary search on down_offsets
+
+        time complexity: O(log|L|)
+        """
+        low=0
+        high=2*self.n-1
+        while low<high:
+            mid=(low+high+1)//2
+            if self.down_offsets[mid]<=i:
+                low=mid
+            else:
+                high=mid-1
+        return low
+
+    def save(self, path: str) -> None:
+        """
+        writes the hierarchy to a binary file so it can be loaded at startup instead of being rebuilt, the same kind of file
+        as RoadNetwork.save. a 40 byte header (HIERARCHY_HEADER: magic, version, n, amount of up edges, amount of down edges,
+        weight typecode) then pBool padded to a multiple of 8 bytes, then rank, the up CSR and the down CSR arrays in the order 
+        of _saved as little endian 8 byte ints (the weights as 8 byte floats when they are not ints).
+
+        @param path: the file to write to
+
+        time complexity: O(|L|+|R|+S)
+        aux space complexity: O(|L|) plus O(|R|+S) only on big endian machines where the arrays are swapped first
+        """
+        typecode=self.up_weights.typecode
+        with open(path,"wb") as file:
+            file.write(HIERARCHY_HEADER.pack(HIERARCHY_MAGIC,HIERARCHY_VERSION,self.n,len(self.up_targets),
+                                             len(self.down_sources),typecode.encode()))
+            file.write(bytes(self.pBool)+bytes(-self.n%8))
+            for name in self._saved[2:]:
+                values=getattr(self,name)
+                if sys.byteorder=="big":
+                    values=array(values.typecode,values)
+                    values.byteswap()
+                file.write(memoryview(values).cast('B'))
+
+    @classmethod
+    def load(cls, path: str) -> "ContractionHierarchy":
+        """
+        loads a hierarchy written by save, the arrays are read straight into typed arrays so nothing but numbers is read
+
+        @param path: the file to read from
+        @return the ContractionHierarchy
+        @raises ValueError: if the file is not a contraction hierarchy file or is truncated
+
+        time complexity: O(|L|+|R|+S)
+        aux space complexity: O(|L|+|R|+S)
+        """
+        with open(path,"rb") as file:
+            data=file.read()
+        if len(data)<HIERARCHY_HEADER.size:
+            raise ValueError(path+" is not a contraction hierarchy file")
+        magic, version, n, up, down, typecode = HIERARCHY_HEADER.unpack_from(data,0)
+        if magic!=HIERARCHY_MAGIC or version!=HIERARCHY_VERSION:
+            raise ValueError(path+" is not a contraction hierarchy file")
+        typecode=typecode.decode()
+        flags=n+(-n%8)
+        sizes=(2*n,2*n+1,up,up,up,2*n+1,down,down,down)
+        typecodes=('q','q','q',typecode,'q','q','q',typecode,'q')
+        if len(data)!=HIERARCHY_HEADER.size+flags+8*sum(sizes):
+            raise ValueError(path+" is truncated")
+
+        hierarchy=cls.__new__(cls)
+        hierarchy.n=n
+        position=HIERARCHY_HEADER.size
+        hierarchy.pBool=bytearray(data[position:position+n])
+        position+=flags
+        for name, size, code in zip(cls._saved[2:],sizes,typecodes):
+            values=array(code)
+            values.frombytes(data[position:position+8*size])
+            if sys.byteorder=="big":
+                values.byteswap()
+            setattr(hierarchy,name,values)
+            position+=8*size
+        return hierarchy
+
+    _saved=("n","pBool","rank","up_offsets","up_targets","up_weights","up_middle",
+            "down_offsets","down_sources","down_weights","down_middle")
+
+
+def select_sections(occupancy_probability: list[list], width: int = 1) -> list:
     """
     Function Description: function to determine which sections we should remove to minimise the amount of space taken away as
                           according to the constraints 
@@ -269,12 +1688,19 @@ def select_sections(occupancy_probability: list[list]) -> list:
                             the space complexity is O(m*n + n) = O(m*n) as m*n dominates
     -----------------------------------------------------------------------------------------------------------------------------------
 
+    for buildings where the next section can be up to width columns away the work is handed to select_sections_rolling,
+    which finds each rows minimums with a sliding window so it stays O(n*m) however wide the band is.
+    -----------------------------------------------------------------------------------------------------------------------------------
+
     @param occupancy_probability: an array of n rows and m columns containing occupancy probabilities 
+    @param width: how many columns apart the sections of adjacent rows can be, 1 is the original constraint
     @return: the list containing the total_min_occupancy as well as the sections to be removed as tuples
 
     time complexity: O(n*m) 
     space complexity: O(n*m) 
     """
+    if width!=1:
+        return select_sections_rolling(occupancy_probability,width)
      
     n = len(occupancy_probability)                  #number of rows
     m = len(occupancy_probability[0])               #number of columns 
@@ -370,3 +1796,585 @@ def backtrack_occupancy(dec_matrix: list, n:int, m:int):
 
     return output   
 
+
+
+def select_sections_rolling(occupancy_probability: list[list], width: int = 1) -> list:
+    """
+    Function Description: the same as select_sections, with the same output and the same choice between equal minimums, 
+                          but only two rows of the running minimums are kept and the choice made in each cell is stored 
+                          as a single signed byte (-1, 0 or +1 for the column above it) instead of a (value, index) tuple.
+                          each row is worked out a whole row at a time with map and list comprehensions rather than
+                          branching per cell.
+                          with a wider band each row is worked out by next_window_row instead, storing the choices as
+                          offsets from -width to +width.
+
+    @param occupancy_probability: an array of n rows and m columns containing occupancy probabilities 
+    @param width: how many columns apart the sections of adjacent rows can be
+    @return: the list containing the total_min_occupancy as well as the sections to be removed as tuples
+    @raises ValueError: if width is negative
+
+    time complexity: O(n*m) whatever the width
+    aux space complexity: O(n*m) bytes for the choices (more for widths over 127) plus O(m) for the rows
+    """
+    n = len(occupancy_probability)
+    m = len(occupancy_probability[0])
+    if width<0:
+        raise ValueError("width can not be negative")
+
+    offsets=array('b' if width<128 else 'q',bytes(n*m*(1 if width<128 else 8)))     #the first row has nothing above it so stays 0
+    previous=list(occupancy_probability[0])
+    for i in range(1,n):                        #time: O(n*m)
+        if width==1:
+            previous=next_minimum_row(previous,occupancy_probability[i],offsets,i*m)
+        else:
+            previous=next_window_row(previous,occupancy_probability[i],offsets,i*m,width)
+
+    return backtrack_offsets(previous,offsets,n,m)
+
+def select_sections_stream(rows, spill_path: str = None) -> list:
+    """
+    Function Description: select_sections over rows that come one at a time from any iterable (a generator, a file reader,
+                          a sensor feed), so the occupancy matrix is never held in memory. only the current row of running 
+                          minimums is kept, the choices of each row are appended to a file as they are made and the file is
+                          then memory mapped for the backtracking, so the operating system pages them in as needed.
+
+    @param rows: an iterable of the rows of occupancy probabilities, each with the same amount of columns
+    @param spill_path: the file to write the choices to, a temporary file that is deleted afterwards if not given
+    @return: the list containing the total_min_occupancy as well as the sections to be removed as tuples
+    @raises ValueError: if there are no rows or a row does not have the same amount of columns as the first
+
+    time complexity: O(n*m) 
+    aux space complexity: O(m) in memory and O(n*m) bytes on disk
+    """
+    rows=iter(rows)
+    try:
+        previous=list(next(rows))
+    except StopIteration:
+        raise ValueError("there are no rows to select sections from")
+    m=len(previous)
+    n=1
+
+    if spill_path is None:
+        spill=tempfile.TemporaryFile()
+    else:
+        spill=open(spill_path,"w+b")
+    with spill:
+        choices=array('b',bytes(m))
+        spill.write(choices)                    #the first row has nothing above it
+        for row in rows:                        #time: O(n*m)
+            if len(row)!=m:
+                raise ValueError("row "+str(n)+" has "+str(len(row))+" columns but the first row has "+str(m))
+            previous=next_minimum_row(previous,row,choices,0)
+            spill.write(choices)
+            n+=1
+        spill.flush()
+
+        with mmap.mmap(spill.fileno(),0,access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                with view.cast('b') as offsets:
+                    return backtrack_offsets(previous,offsets,n,m)
+
+def select_sections_parallel(occupancy_probability: list[list], workers: int = None) -> list:
+    """
+    Function Description: select_sections with the columns split into tiles, one per process. each cell only needs the 
+                          three cells above it, so each row the processes work out their tiles of it from the row above, 
+                          reading the one column either side of their tile (the halo) from their neighbours, then wait at 
+                          a barrier for everyone before starting the next row. the occupancy matrix, the two rows of running
+                          minimums and the choices are all in shared memory so nothing is sent between processes. the same
+                          additions and comparisons are done in the same order as select_sections so the output is identical.
+                          the barrier after every row is a real cost, so this is only faster than select_sections_rolling
+                          on wide floors with a cpu per worker, use benchmark_select_sections to check before choosing it.
+
+    @param occupancy_probability: an array of n rows and m columns containing occupancy probabilities 
+    @param workers: the amount of processes, defaults to the amount of cpus, small floors and ones whose sums could 
+                    overflow the shared 64 bit arrays are done in this process
+    @return: the list containing the total_min_occupancy as well as the sections to be removed as tuples
+
+    time complexity: O(n*m/W + n*W) where W is the workers, the second part being the barrier waits
+    aux space complexity: O(n*m) shared
+    """
+    n = len(occupancy_probability)
+    m = len(occupancy_probability[0])
+    if workers is None:
+        workers=os.cpu_count() or 1
+    workers=min(workers,m//2)                   #each tile gets at least two columns
+    if workers<=1 or n==1:
+        return select_sections_rolling(occupancy_probability)
+
+    typecode=weight_typecode(value for row in occupancy_probability for value in row)
+    mixed=typecode=='d' and any(not isinstance(value,float) for row in occupancy_probability for value in row)
+    largest=max((abs(value) for row in occupancy_probability for value in row if isinstance(value,int)),default=0)
+    if n*largest>=(2**63 if typecode=='q' else 2**53):     #the running sums would not fit in the shared 64 bit ints, 
+        return select_sections_rolling(occupancy_probability)   #or not every int would be exact as a double
+    sizes=(8*n*m,8*2*m,n*m)                     #the matrix, the two running minimum rows and the choices
+    if mixed:
+        sizes+=(n*m+2*m,)                       #and which cells and running minimums are floats, as the matrix is all floats
+    blocks=[]
+    views=[]                                    #every view of the blocks has to be released before they can be closed
+    try:
+        for size in sizes:
+            blocks.append(SharedMemory(create=True,size=size))
+        matrix=blocks[0].buf.cast(typecode)
+        views.append(matrix)
+        for i in range(n):
+            matrix[i*m:(i+1)*m]=array(typecode,occupancy_probability[i])
+        rows=blocks[1].buf.cast(typecode)
+        views.append(rows)
+        rows[0:m]=matrix[0:m]
+        matrix.release()
+        if mixed:
+            floats=blocks[3].buf.cast('B')
+            views.append(floats)
+            for i in range(n):
+                floats[i*m:(i+1)*m]=bytes(isinstance(value,float) for value in occupancy_probability[i])
+            floats[n*m:n*m+m]=floats[0:m]
+
+        barrier=Barrier(workers)
+        processes=[]
+        for t in range(workers):
+            lo=t*m//workers
+            hi=(t+1)*m//workers
+            processes.append(Process(target=_tile_worker,args=([block.name for block in blocks],typecode,n,m,lo,hi,barrier)))
+        for process in processes:
+            process.start()
+        running=list(processes)
+        while running:                          #a killed worker never reaches barrier.abort so the others would wait
+            running[0].join(0.05)               #forever, abort it for them as soon as any worker has died
+            if any(process.exitcode not in (None,0) for process in processes):
+                barrier.abort()
+            running=[process for process in running if process.exitcode is None]
+        if any(process.exitcode!=0 for process in processes):
+            raise RuntimeError("a select_sections_parallel worker failed")
+
+        last_row=rows[((n-1)%2)*m:((n-1)%2+1)*m].tolist()
+        rows.release()
+        if mixed:                               #give the running minimums back the type select_sections would have
+            base=n*m+((n-1)%2)*m
+            last_row=[value if floats[base+j] else int(value) for j, value in enumerate(last_row)]
+            floats.release()
+        offsets=blocks[2].buf.cast('b')
+        views.append(offsets)
+        output=backtrack_offsets(last_row,offsets,n,m)
+    finally:
+        for view in views:
+            view.release()
+        for block in blocks:
+            try:
+                block.close()
+            finally:
+                block.unlink()
+    return output
+
+def benchmark_select_sections(occupancy_probability: list[list], workers: tuple = (2,4), repeat: int = 3) -> dict:
+    """
+    Function description: times select_sections_rolling against select_sections_parallel with each amount of workers on
+    the same floor, to check whether the tiles pay off on this machine before choosing them. the barrier after every row
+    costs a wait per worker, so the processes only help when each tile has enough columns to outweigh it and there are
+    real cpus for them. each is run repeat times and the best run is kept, they all have to agree on the output.
+
+    @param occupancy_probability: an array of n rows and m columns containing occupancy probabilities
+    @param workers: the amounts of processes to time select_sections_parallel with
+    @param repeat: how many times to run each
+    @return a dictionary of the milliseconds for "rolling" and for every amount of workers
+    @raises RuntimeError: if select_sections_parallel gives a different output
+
+    time complexity: O(repeat*(1+W)*n*m) where W is the amount of worker counts
+    aux space complexity: O(n*m)
+    """
+    results={}
+    expected=None
+    for count in (1,)+tuple(workers):
+        best=float("inf")
+        for _ in range(repeat):
+            begin=time.perf_counter()
+            if count==1:
+                output=select_sections_rolling(occupancy_probability)
+            else:
+                output=select_sections_parallel(occupancy_probability,count)
+            best=min(best,time.perf_counter()-begin)
+        if expected is None:
+            expected=output
+        elif output!=expected:
+            raise RuntimeError("select_sections_parallel with "+str(count)+" workers gave a different output")
+        results["rolling" if count==1 else count]=best*1000
+    return results
+
+def _tile_worker(names: list, typecode: str, n: int, m: int, lo: int, hi: int, barrier) -> None:
+    """
+    works out columns lo to hi-1 of every row for select_sections_parallel, waiting for the other tiles after each row
+    """
+    blocks=[SharedMemory(name=name) for name in names]
+    matrix=blocks[0].buf.cast(typecode)
+    rows=blocks[1].buf.cast(typecode)
+    offsets=blocks[2].buf.cast('b')
+    floats=blocks[3].buf.cast('B') if len(blocks)>3 else None
+    inf=float("inf")
+    try:
+        for i in range(1,n):
+            above=((i-1)%2)*m
+            below=(i%2)*m
+            previous=rows[above+lo:above+hi].tolist()
+            left=[inf if lo==0 else rows[above+lo-1]]+previous[:-1]         #halo column from the tile to the left
+            right=previous[1:]+[inf if hi==m else rows[above+hi]]            #and from the tile to the right
+            best=list(map(min,left,previous,right))                           #in the same order as make_decision_matrix
+            offsets[i*m+lo:i*m+hi]=array('b',[0 if center==smallest else (-1 if before==smallest else 1)
+                                              for center, before, smallest in zip(previous,left,best)])
+            if floats is not None:              #a running minimum is a float if its cell is or the minimum added to it was
+                above_floats=bytes(floats[n*m+above+lo:n*m+above+hi])
+                left_floats=[0 if lo==0 else floats[n*m+above+lo-1]]+list(above_floats[:-1])
+                right_floats=list(above_floats[1:])+[0 if hi==m else floats[n*m+above+hi]]
+                floats[n*m+below+lo:n*m+below+hi]=bytes(cell or (before_float if before==smallest else 
+                                                                 (center_float if center==smallest else after_float))
+                                                        for cell, before, center, smallest, before_float, center_float, after_float
+                                                        in zip(floats[i*m+lo:i*m+hi],left,previous,best,left_floats,above_floats,right_floats))
+            rows[below+lo:below+hi]=array(typecode,[value+smallest for value, smallest in zip(matrix[i*m+lo:i*m+hi].tolist(),best)])
+            barrier.wait()
+    except BaseException:
+        barrier.abort()                         #let the other tiles stop instead of waiting forever
+        raise
+    finally:
+        matrix.release()
+        rows.release()
+        offsets.release()
+        if floats is not None:
+            floats.release()
+        for block in blocks:
+            block.close()
+
+def next_minimum_row(previous: list, row: list, offsets, base: int) -> list:
+    """
+    function description: works out one row of the decision matrix from the one above it, by lining up the row above 
+    shifted left and right so the three sections adjacent to every column can be compared all at once. equal minimums
+    prefer the same column, then the one to the left, then the one to the right, the same as make_decision_matrix. the 
+    minimum that is added is taken left, same, right as make_decision_matrix does, so when equal values are an int and a 
+    float the running minimums keep the same type as there.
+
+    @param previous: the running minimums of the row above
+    @param row: this rows occupancy probabilities
+    @param offsets: the array of choices to write this rows choices into
+    @param base: the index in offsets of this rows first column
+    @return the running minimums of this row
+
+    time complexity: O(m)
+    aux space complexity: O(m)
+    """
+    inf=float("inf")
+    left=[inf]+previous[:-1]                    #left[j] is previous[j-1], nothing past the edges
+    right=previous[1:]+[inf]
+    best=list(map(min,left,previous,right))
+    offsets[base:base+len(row)]=array('b',[0 if above==smallest else (-1 if before==smallest else 1) 
+                                           for above, before, smallest in zip(previous,left,best)])
+    return [value+smallest for value, smallest in zip(row,best)]
+
+def next_window_row(previous: list, row: list, offsets, base: int, width: int) -> list:
+    """
+    function description: works out one row of the decision matrix when the section above can be up to width columns away.
+    the windows of neighbouring columns overlap in all but two cells, so the minimum of each window is kept with a monotone 
+    deque of column indices whose values only go up from front to back. each column is added and removed once, so the row 
+    costs O(m) however wide the window. equal minimums go to the leftmost column in the window.
+
+    @param previous: the running minimums of the row above
+    @param row: this rows occupancy probabilities
+    @param offsets: the array of choices to write this rows choices into, as the column above minus this column
+    @param base: the index in offsets of this rows first column
+    @param width: how many columns either side the section above can be
+    @return the running minimums of this row
+
+    time complexity: O(m)
+    aux space complexity: O(m)
+    """
+    m=len(row)
+    window=deque()
+    next_column=0
+    output=[]
+    for j in range(m):
+        while next_column<m and next_column<=j+width:        #bring the right edge of the window up to j+width
+            while len(window)>0 and previous[window[-1]]>previous[next_column]:
+                window.pop()
+            window.append(next_column)
+            next_column+=1
+        while window[0]<j-width:                            #drop what fell off the left edge
+            window.popleft()
+        smallest=window[0]
+        offsets[base+j]=smallest-j
+        output.append(row[j]+previous[smallest])
+    return output
+
+def backtrack_offsets(last_row: list, offsets, n: int, m: int) -> list:
+    """
+    function description: picks the best section of the last row and follows the stored choices back up to the first row.
+    the last row is picked the same way backtrack_occupancy does, the smallest value and between equal ones the smallest
+    column it came from and then the leftmost. the minimum given back is that cells running minimum itself, so it is the 
+    same number and type as select_sections gives as long as the rows were made the same way as make_decision_matrix 
+    (see next_minimum_row).
+
+    @param last_row: the running minimums of the last row
+    @param offsets: anything indexable holding the -1/0/+1 choice of every cell, row by row
+    @param n: the amount of rows
+    @param m: the amount of columns
+    @return returns a list which contains the minimum total occupancy rate and the tuples of which location should be removed per row
+
+    time complexity: O(n+m)
+    aux space complexity: O(n)
+    """
+    base=(n-1)*m
+    if n==1:
+        index=min(range(m),key=lambda j:last_row[j])
+    else:
+        index=min(range(m),key=lambda j:(last_row[j],j+offsets[base+j]))
+
+    sections_location=[(n-1,index)]
+    for i in range(n-1,0,-1):                   #follow the choices back up O(n)
+        index+=offsets[i*m+index]
+        sections_location.append((i-1,index))
+    sections_location.reverse()
+
+    return [last_row[sections_location[-1][1]],sections_location]
+
+
+class SectionPlanner:
+    """
+    Keeps the decision matrix of select_sections around so that when a few occupancy probabilities change, only the cells
+    below them that actually change are worked out again. a cell only depends on the three cells above it, so a change at
+    (i, j) can only spread one column further each row down (a cone), and it stops spreading as soon as a row has no 
+    values that changed.
+
+    Attributes;
+    n: the amount of rows
+    m: the amount of columns
+    occupancy: this planners own copy of the occupancy probabilities
+    values: the n rows of running minimums
+    offsets: the -1/0/+1 choice of every cell, row by row, the same as select_sections_rolling
+    """
+    def __init__(self, occupancy_probability: list[list]):
+        """
+        builds the full decision matrix once
+
+        @param occupancy_probability: an array of n rows and m columns containing occupancy probabilities 
+
+        time complexity: O(n*m)
+        aux space complexity: O(n*m)
+        """
+        self.n=len(occupancy_probability)
+        self.m=len(occupancy_probability[0])
+        self.occupancy=[list(row) for row in occupancy_probability]
+        self.offsets=array('b',bytes(self.n*self.m))
+        self.values=[list(self.occupancy[0])]
+        for i in range(1,self.n):
+            self.values.append(next_minimum_row(self.values[-1],self.occupancy[i],self.offsets,i*self.m))
+
+    def _cell(self, i: int, j: int):
+        """
+        works out the running minimum and choice of one cell from the row above, by running next_minimum_row on just the 
+        columns either side of it so the minimum added and the choice are always the same as there
+
+        @return a tuple of the value and the choice
+
+        time complexity: O(1)
+        """
+        if i==0:
+            return self.occupancy[0][j], 0
+        lo=max(j-1,0)
+        hi=min(j+2,self.m)                      #only column j is kept, its neighbours in the slice are the real ones
+        choices=array('b',bytes(hi-lo))
+        values=next_minimum_row(self.values[i-1][lo:hi],self.occupancy[i][lo:hi],choices,0)
+        return values[j-lo], choices[j-lo]
+
+    def update(self, i: int, j: int, value) -> list:
+        """
+        changes one occupancy probability and repairs the cells below it
+
+        @param i: the row of the section
+        @param j: the column of the section
+        @param value: the new occupancy probability
+        @return the new plan, the same as select_sections would give for the changed matrix
+
+        time complexity: O(C+n) where C is the amount of cells whose value changed, at most O(n*m)
+        aux space complexity: O(m)
+        """
+        self.occupancy[i][j]=value
+        changed=[j]
+        while len(changed)>0 and i<self.n:
+            row=self.values[i]
+            changed_now=[]
+            for column in changed:
+                new_value, choice = self._cell(i,column)
+                self.offsets[i*self.m+column]=choice
+                if new_value!=row[column] or type(new_value) is not type(row[column]):
+                    row[column]=new_value
+                    changed_now.append(column)
+            next_columns=set()
+            for column in changed_now:          #only the cells under a changed value can change next row
+                for below in (column-1,column,column+1):
+                    if 0<=below<self.m:
+                        next_columns.add(below)
+            changed=sorted(next_columns)
+            i+=1
+        return self.plan()
+
+    def plan(self) -> list:
+        """
+        @return the list containing the total_min_occupancy as well as the sections to be removed as tuples
+
+        time complexity: O(n+m)
+        """
+        return backtrack_offsets(self.values[-1],self.offsets,self.n,self.m)
+
+
+def select_sections_top_k(occupancy_probability: list[list], k: int) -> list:
+    """
+    Function Description: the k best removal plans instead of just the best one. the plans are the paths down the 
+                          decision matrix, which is a layered DAG, so each cell keeps the k cheapest paths ending at it 
+                          as (total, column above, rank above), found by merging the sorted lists of the three cells 
+                          above it and stopping after k. equal totals prefer the same column, then left, then right like
+                          select_sections, and the best of each cell adds the same minimum make_decision_matrix does, so 
+                          the first plan is the one select_sections gives, total type included.
+
+    @param occupancy_probability: an array of n rows and m columns containing occupancy probabilities 
+    @param k: how many plans to give
+    @return: a list of up to k plans from best to worst, each like select_sections output [total, sections_location]
+
+    time complexity: O(n*m*k) 
+    aux space complexity: O(n*m*k)
+    """
+    n = len(occupancy_probability)
+    m = len(occupancy_probability[0])
+    if k<=0:
+        return []
+
+    best=[[[(occupancy_probability[0][j],-1,-1)] for j in range(m)]]       #best[i][j] is the sorted k best ending at (i,j)
+    for i in range(1,n):                        #time: O(n*m*k)
+        above=best[-1]
+        row=[]
+        for j in range(m):
+            merged=[]
+            for column in (j,j-1,j+1):          #same order of preference as the decision matrix
+                if 0<=column<m:
+                    merged.append([(total,column,rank) for rank, (total, _, _) in enumerate(above[column])])
+            cell=[]
+            for total, column, rank in islice(heapq.merge(*merged,key=lambda entry:entry[0]),k):
+                cell.append((occupancy_probability[i][j]+total,column,rank))
+            smallest=min(above[column][0][0] for column in (j-1,j,j+1) if 0<=column<m)
+            cell[0]=(occupancy_probability[i][j]+smallest,)+cell[0][1:]    #add the leftmost equal best above like the
+            row.append(cell)                                                #decision matrix so plan 0 has its type too
+        best.append(row)
+
+    last=[]
+    for j in range(m):                          #between equal totals the best of each cell first, then the same choice
+        for rank, (total, column, _) in enumerate(best[-1][j]):     #of last section as backtrack_occupancy
+            last.append((total,rank,column if n>1 else 0,j))
+    last.sort()
+
+    plans=[]
+    for total, rank, _, j in last[:k]:          #follow each plan back up O(k*n)
+        sections_location=[]
+        for i in range(n-1,-1,-1):
+            sections_location.append((i,j))
+            _, j, rank = best[i][j][rank]
+        sections_location.reverse()
+        plans.append([total,sections_location])
+    return plans
+
+def select_disjoint_sections(occupancy_probability: list[list], k: int) -> list:
+    """
+    Function Description: k removal plans that never use the same section, with the smallest total occupancy over all of them.
+                          this is a min cost flow of k units from the top row to the bottom row where every section has 
+                          capacity 1 (split into an in and out node joined by an edge costing its occupancy), solved with
+                          successive shortest paths. the first potentials come from one pass down the rows as the network
+                          starts as a DAG, then each path is found with dijkstra on the reduced costs, which stay non negative.
+
+    @param occupancy_probability: an array of n rows and m columns containing occupancy probabilities 
+    @param k: how many plans to give, fewer are given if there are not enough columns
+    @return: a list of the plans, each like select_sections output [total, sections_location], ordered by total
+
+    time complexity: O(k*n*m*log(n*m)) 
+    aux space complexity: O(n*m)
+    """
+    n = len(occupancy_probability)
+    m = len(occupancy_probability[0])
+    cells=n*m
+    source=2*cells
+    sink=source+1
+    size=sink+1
+    inf=float("inf")
+
+    edges=[[] for _ in range(size)]             #arc e and e^1 are each others reverse
+    to=[]
+    capacity=[]
+    cost=[]
+    def add_arc(u, v, c):
+        edges[u].append(len(to))
+        to.append(v)
+        capacity.append(1)
+        cost.append(c)
+        edges[v].append(len(to))
+        to.append(u)
+        capacity.append(0)
+        cost.append(-c)
+
+    potential=[inf]*size                        #shortest distances in the starting DAG, time: O(n*m)
+    potential[source]=0
+    for j in range(m):
+        add_arc(source,2*j,0)
+        potential[2*j]=0
+    for i in range(n):
+        for j in range(m):
+            cell=2*(i*m+j)
+            add_arc(cell,cell+1,occupancy_probability[i][j])
+            potential[cell+1]=potential[cell]+occupancy_probability[i][j]
+            if i==n-1:
+                add_arc(cell+1,sink,0)
+                potential[sink]=min(potential[sink],potential[cell+1])
+            else:
+                for column in (j-1,j,j+1):
+                    if 0<=column<m:
+                        below=2*((i+1)*m+column)
+                        add_arc(cell+1,below,0)
+                        potential[below]=min(potential[below],potential[cell+1])
+
+    for _ in range(min(k,m)):                   #one unit of flow per plan
+        distances=[inf]*size
+        pred=[-1]*size
+        distances[source]=0
+        queue=[(0,source)]
+        while len(queue)>0:
+            dist, u = heapq.heappop(queue)
+            if dist>distances[u]:
+                continue
+            for e in edges[u]:
+                if capacity[e]>0:
+                    v=to[e]
+                    new_dist=dist+cost[e]+potential[u]-potential[v]
+                    if new_dist<distances[v]:
+                        distances[v]=new_dist
+                        pred[v]=e
+                        heapq.heappush(queue,(new_dist,v))
+        if distances[sink]==inf:
+            break
+        for v in range(size):                   #capping at the sink distance keeps reduced costs non negative 
+            potential[v]+=min(distances[v],distances[sink])     #for states the search did not reach
+        v=sink
+        while v!=source:                        #augment along the path
+            e=pred[v]
+            capacity[e]-=1
+            capacity[e^1]+=1
+            v=to[e^1]
+
+    plans=[]
+    for e in edges[source]:
+        if e%2==0 and capacity[e]==0:           #a used arc out of the source starts a plan
+            node=to[e]
+            sections_location=[]
+            total=None
+            while node!=sink:
+                i, j = divmod(node//2,m)
+                sections_location.append((i,j))
+                value=occupancy_probability[i][j]
+                total=value if total is None else value+total
+                for arc in edges[node+1]:
+                    if arc%2==0 and capacity[arc]==0:
+                        node=to[arc]
+                        break
+            plans.append([total,sections_location])
+    plans.sort(key=lambda plan:(plan[0],plan[1][0][1]))
+    return plans
@@ -1,9 +1,19 @@
+import heapq
+import os
+import struct
+import sys
+import time
+from array import array
+from collections import deque
+from multiprocessing import Pool
 from typing import Any
 
 
 class Graph:
     """
-    Will represent a network which has maxIn and maxOuts.
+    Will represent a network which has maxIn and maxOuts as a residual network, every data centre i is split into
+    an in node i*3, a middle node i*3+1 and an out node i*3+2 and the arcs are stored in flat arrays grouped by the
+    node they leave (compressed sparse rows) where every arc has a reverse arc so flow can be cancelled.
 
     Attributes;
     source: the source of the array
@@ -12,15 +22,23 @@ class Graph:
     maxIn: list of the maximum flow in values
     maxOut: list of the maximum flow out values
     supersink: the id of the supersink
-    length: the length of the adjacency list
-    flow: an adjacency list which has the flows that are present in the network
-    capacity: an adjacency list which has the capacities that limit the network
+    length: the amount of nodes in the residual network
+    offsets: the arcs leaving node u are offsets[u] to offsets[u+1]-1
+    head: the node each arc goes to
+    capacity: the capacity of each arc, reverse arcs have capacity 0
+    flow: the flow currently on each arc, a reverse arc holds minus the flow of its arc
+    reverse: the id of the reverse arc of each arc
+    arcs: the id of every arc in the order they were listed, the channels then the maxIn and maxOut arc of every
+          centre then the supersink arcs
+    inSum: for every centre the capacity it gets when it is a target
+    inDegree: for every centre the amount of channels going into it
+    sinkArc: for every target the id of its arc to the supersink, -1 for the other centres
     """
     def __init__(self,connections: list,maxIn:list,maxOut:list,origin,targets):
         """
         initialises all the important attributes for the array
 
-        time complexity: O(|C|*|D|)
+        time complexity: O(|C|+|D|)
         aux space complexity: O(|C|+|D|)
         """
         ## initalise with useful attributes
@@ -31,117 +49,462 @@ class Graph:
         self.maxOut=maxOut
         self.supersink=None
         self.length=len(maxIn)*3+1
-        self.flow=self.make_adjacency_list_with_max_in_and_out(connections,maxIn,maxOut,True)
-        # print(self.flow)
-        self.capacity=self.make_adjacency_list_with_max_in_and_out(connections,maxIn,maxOut)
-        # print(self.capacity)
-        
-        #calling it 2 * so O(3(|C|*|D|)) -> O(|C|*|D|)
+        self.make_residual_network(connections,maxIn,maxOut)
 
-    def make_adjacency_list_with_max_in_and_out(self,graph: list,maxIn:list,maxOut:list,forFlow=False) -> list: 
+    def make_residual_network(self,graph: list,maxIn:list,maxOut:list) -> None: 
         """
-        Function Description: transforms the communication and maxes lists into an adjacency list representation
+        Function Description: transforms the communication and maxes lists into the residual network,
                               this representation will have extra edges which will represent the limits set by maxIn and maxOut
                               every maxIn will be the one that the other edges point to then that points to the id*3 then that points
-                              to the maxOut which will then point to all the nodes this node can reach therefore abides by the bounds. 
+                              to the maxOut which will then point to all the nodes this node can reach therefore abides by the bounds.
+                              the arcs are first listed as (tail, head, capacity) then counted per node and placed in the flat arrays
+                              next to their reverse arc.
 
         @param graph: a matrix representing the network
         @param maxIn: a matrix which has the maximum flow for an input to a vertex i
         @param maxOut: a matrix which has the maximum flow out for a vertex to go to another.
-        @param forFlow: boolean value for whether we are building the flow diagram
-        @return: the list representing the adjacency list
+        @postcondition offsets, head, capacity, flow and reverse hold the residual network with no flow
 
-        time complexity: O(|C|+|D|+|C|*|D|) -> O(|C|*|D|) where D is the data centres (nodes) and C the communication channels (edges)
+        time complexity: O(|C|+|D|) where D is the data centres (nodes) and C the communication channels (edges)
         aux space complexity: O(|C|+|D|) where D is the data centres (nodes) and C the communication channels (edges)
         """
+        tails=array('q')
+        heads=array('q')
+        capacities=array('q')
+        for communication_line in graph:  #every channel goes from the out node of one centre to the in node of the other O(|C|)
+            tails.append(communication_line[0]*3+2)
+            heads.append(communication_line[1]*3)
+            capacities.append(communication_line[2])
 
-        #for the max in and out thinking for every one there should be an edge to it with capacity of whatever, then itself,then capacity of it out to whichever node it can go to
-        maximum=len(maxIn)
-        adjacency_list=[]      
-        for i in range((maximum*3)):       #time + aux space comp: O(|3*D|)->O(|D|)
-            adjacency_list.append([])
+        for i in range(len(maxIn)):      # this loop will add the limits for capacity in and capacity out time + aux space comp O(|D|)
+            index=i*3                    # the max out arc of centre i ends up at len(graph)+2*i+1
+            tails.append(index)
+            heads.append(index+1)
+            capacities.append(maxIn[i])
+            tails.append(index+1)
+            heads.append(index+2)
+            capacities.append(maxOut[i])
 
-        for communication_line in graph:  #loop through all edges and add  edge at 3 * its vertex id time + aux space comp O(|C|)      
-            index=communication_line[0]*3+1
-            goingTo=communication_line[1]*3
-            throughput=communication_line[2]
-            if forFlow:
-                throughput=0
-            adjacency_list[index+1].append([goingTo,throughput]) 
-        #basically they increment by like the third element showing where next
+        self.add_super(tails,heads,capacities,self.targets)     #O(|C|+|D|)
 
-        for i in range(len(maxIn)):      # this loop will add the limits for capacity in and capacity out time + aux space comp O(|D|)
-            index=i*3
-            if forFlow:
-                adjacency_list[index].append([index+1,0])
-                adjacency_list[index+1].append([index+2,0])
-            else:
-                adjacency_list[index].append([index+1,maxIn[i]])
-                adjacency_list[index+1].append([index+2,maxOut[i]])
-            
-        self.add_super(adjacency_list,self.targets,forFlow)     #O(|C|*|D|)
+        self.arcs=array('q',bytes(8*len(tails)))
+        count=[0]*(self.length+1)        #count the arcs leaving every node, each arc and its reverse O(|C|+|D|)
+        for k in range(len(tails)):
+            count[tails[k]+1]+=1
+            count[heads[k]+1]+=1
+        for u in range(self.length):
+            count[u+1]+=count[u]
+        self.offsets=array('q',count)
 
-        return adjacency_list
+        arcs=len(tails)*2
+        self.head=array('q',bytes(8*arcs))
+        self.capacity=array('q',bytes(8*arcs))
+        self.flow=array('q',bytes(8*arcs))
+        self.reverse=array('q',bytes(8*arcs))
+        nextFree=count[:self.length]    #next free slot of every node O(|C|+|D|)
+        for k in range(len(tails)):
+            u=tails[k]
+            v=heads[k]
+            forward=nextFree[u]
+            nextFree[u]+=1
+            backward=nextFree[v]
+            nextFree[v]+=1
+            self.head[forward]=v
+            self.head[backward]=u
+            self.capacity[forward]=capacities[k]
+            self.reverse[forward]=backward
+            self.reverse[backward]=forward
+            self.arcs[k]=forward
+        for target in range(len(maxIn)):
+            if self.sinkArc[target]>=0:
+                self.sinkArc[target]=self.arcs[self.sinkArc[target]]
     
-    def add_super(self,listChosen:list,targets:list,forFlow):
+    def add_super(self,tails:array,heads:array,capacities:array,targets:list):
         """ 
-        Function Description: This adds the supersink node to a list given some targets.
+        Function Description: This adds the supersink node to the arcs given some targets. the capacity a target gets is the
+                              sum over its incoming channels of the channel plus the targets maxIn and maxOut, these sums are
+                              found for every node in one pass over the channels so each target is then only a lookup.
 
-        @param listChosen: adjacency list to add the super sink to
+        @param tails: the node each arc leaves
+        @param heads: the node each arc goes to
+        @param capacities: the capacity of each arc
         @param targets: list of the targets we want to go to
-        @param forFlow: boolean value for whether we are building the flow diagram
 
-        @postcondition listchosen now has a new superSink node
+        @postcondition there is a new superSink node with an arc from the out node of every target, inSum, inDegree
+                       and sinkArc are set
 
-        time complexity: O(|C|*|D|) where D is the data centres (nodes) and C the communication channels (edges)
-        aux space complexity: O(1) 
+        time complexity: O(|C|+|D|) where D is the data centres (nodes) and C the communication channels (edges)
+        aux space complexity: O(|D|) 
         """
-        listChosen.append([])               # add the super sink node
-        self.supersink=len(listChosen)-1
-        
-        for target in targets:              # go through the targets then find every node that can connect to it and add its capacity time comp O(|T|*|C|)
-            temp_weight=0                                              #in worst case targets are |D|-1 size so time comp: O(|D|*|C|)
-            for u,v,weights in self.connections:
-                if v==target:
-                    temp_weight+=weights+self.maxIn[v]+self.maxOut[v]
-            if forFlow:
-                temp_weight=0 
+        self.supersink=self.length-1
+
+        self.inSum=[0]*len(self.maxIn)      # what every node would get as a target O(|C|)
+        self.inDegree=[0]*len(self.maxIn)
+        for u,v,weights in self.connections:
+            self.inSum[v]+=weights+self.maxIn[v]+self.maxOut[v]
+            self.inDegree[v]+=1
+
+        self.sinkArc=array('q',[-1])*len(self.maxIn)    # so a target listed twice only gets one arc to the supersink
+        for target in targets:              # O(|T|) and targets are at most |D|
+            if self.sinkArc[target]>=0:
+                continue
+            self.sinkArc[target]=len(tails)  # swapped for the real arc id once the arrays are built
+            temp_weight=self.inSum[target]
             
-            for i in range(len(listChosen[target*3+1])):        # a target is just a target so it doesnt need the max out to limit it
-                listChosen[target*3+1][i][1]=temp_weight
-            listChosen[target*3+2].append([self.length-1,temp_weight])
+            capacities[len(self.connections)+target*2+1]=temp_weight   # a target is just a target so it doesnt need the max out to limit it
+            tails.append(target*3+2)
+            heads.append(self.supersink)
+            capacities.append(temp_weight)
             
-    def BFS(self,preds:list):
+    def BFS(self,preds:list,start:int=None,end:int=None,threshold:int=1):
         """ 
-        Function Description: Does breadth first search on the graph to find a path returns True if path
+        Function Description: Does breadth first search on the residual network to find a path returns True if path
 
-        @param preds: a list of preds to change and store the previous nodes
+        @param preds: a list of preds to change and store the arc used to reach every node
+        @param start: the node to search from, the source by default
+        @param end: the node to search for, the supersink by default
+        @param threshold: only use arcs that can take at least this much more flow
         @return returns a bool of whether a path is available or not
         @postcondition preds has the path from th supersink to the source if there is a path available
 
         time complexity: O(|C|+|D|) where D is the data centres (nodes) and C the communication channels (edges)
         aux space complexity: O(|D|) where D is the data centres (nodes) and C the communication channels (edges)
         """
+        if start is None:
+            start=self.source*3+1
+        if end is None:
+            end=self.supersink
         visited=[False]*self.length     #size of data centres
-        queue=[self.source*3 +1]        #size of data centres
+        visited[start]=True
+        queue=deque([start])            #size of data centres
         while len(queue)>0:             #will occur O(|D|) times as will always add an unvisited node
-            u=queue.pop(0)
-            for i in range(len(self.flow[u])):  #will occur through all edges so time O(|C|) all together
-                v=self.flow[u][i][0]
-                if not visited[v] and self.flow[u][i][1]<self.capacity[u][i][1]:
+            u=queue.popleft()
+            for e in range(self.offsets[u],self.offsets[u+1]):  #will occur through all edges so time O(|C|) all together
+                v=self.head[e]
+                if not visited[v] and self.capacity[e]-self.flow[e]>=threshold:
                     visited[v]=True
                     queue.append(v)
-                    preds[v]=(u,i)
-                    if v==self.supersink:
+                    preds[v]=e
+                    if v==end:
                         return True
         return False
 
+    def augment(self,start:int,end:int,limit,threshold:int=1)->int:
+        """ 
+        Function Description: pushes up to limit flow from start to end along shortest paths in the residual network,
+                              used to move flow around locally when a capacity goes down.
+
+        @param start: the node the flow leaves
+        @param end: the node the flow goes to
+        @param limit: the most flow to push
+        @param threshold: only use arcs that can take at least this much more flow
+        @return the amount of flow that was pushed
+
+        time complexity: O(|C|*|D|*(|C|+|D|)) where D is the data centres (nodes) and C the communication channels (edges)
+        aux space complexity: O(|D|)
+        """
+        pushed=0
+        preds=[None]*self.length
+        while pushed<limit and self.BFS(preds,start,end,threshold):
+            searching_flow=limit-pushed
+            node=end
+            while node!=start:
+                arc=preds[node]
+                searching_flow=min(searching_flow,self.capacity[arc]-self.flow[arc])
+                node=self.head[self.reverse[arc]]
+            node=end
+            while node!=start:
+                arc=preds[node]
+                self.flow[arc]+=searching_flow
+                self.flow[self.reverse[arc]]-=searching_flow
+                node=self.head[self.reverse[arc]]
+            pushed+=searching_flow
+            preds=[None]*self.length
+        return pushed
+
+    def set_target(self,centre:int,isTarget:bool)->None:
+        """
+        turns a centre that has an arc to the supersink into a target or back into a normal centre, a target takes its
+        inSum through its middle node and to the supersink while a normal centre is limited by its maxOut and has no
+        arc to the supersink. the flow is not changed so it should be zero or reset after.
+
+        time complexity: O(1)
+        aux space complexity: O(1)
+        """
+        middle=self.arcs[len(self.connections)+centre*2+1]
+        if isTarget:
+            self.capacity[middle]=self.inSum[centre]
+            self.capacity[self.sinkArc[centre]]=self.inSum[centre]
+        else:
+            self.capacity[middle]=self.maxOut[centre]
+            self.capacity[self.sinkArc[centre]]=0
+
+    def reset_flow(self)->None:
+        """
+        removes all the flow so the network can be solved again
+
+        time complexity: O(|C|+|D|)
+        aux space complexity: O(|C|+|D|)
+        """
+        self.flow=array('q',bytes(8*len(self.flow)))
+
+
+def dinic(graph: Graph,source:int,sink:int)->int:
+    """
+    Function Description: max flow with Dinic's algorithm, each phase a BFS gives every node its level (distance from the 
+                          source) and then a blocking flow is pushed using only arcs that go up exactly one level, with a 
+                          current arc pointer per node so a dead arc is never looked at twice in the same phase.
+
+    @param graph: the residual network, it is left holding the max flow
+    @param source: the node the flow comes from
+    @param sink: the node the flow goes to
+    @return the value of the max flow
+
+    time complexity: O(|D|^2*|C|) where D is the data centres (nodes) and C the communication channels (edges)
+    aux space complexity: O(|D|)
+    """
+    offsets=graph.offsets
+    head=graph.head
+    capacity=graph.capacity
+    flows=graph.flow
+    reverse=graph.reverse
+    flow=0
+    while True:
+        level=[-1]*graph.length             #BFS for the levels O(|C|+|D|)
+        level[source]=0
+        queue=deque([source])
+        while len(queue)>0:
+            u=queue.popleft()
+            for e in range(offsets[u],offsets[u+1]):
+                if flows[e]<capacity[e] and level[head[e]]<0:
+                    level[head[e]]=level[u]+1
+                    queue.append(head[e])
+        if level[sink]<0:
+            return flow
+
+        pointer=offsets[:graph.length]      #blocking flow with an iterative DFS
+        path=[]
+        u=source
+        while True:
+            if u==sink:
+                pushed=min(capacity[e]-flows[e] for e in path)
+                for e in path:
+                    flows[e]+=pushed
+                    flows[reverse[e]]-=pushed
+                flow+=pushed
+                for i in range(len(path)):      #go back to just before the first arc that got full
+                    if flows[path[i]]==capacity[path[i]]:
+                        del path[i:]
+                        break
+                u=head[path[-1]] if len(path)>0 else source
+                continue
+            end=offsets[u+1]
+            while pointer[u]<end:
+                e=pointer[u]
+                if flows[e]<capacity[e] and level[head[e]]==level[u]+1:
+                    break
+                pointer[u]+=1
+            if pointer[u]<end:              #advance
+                path.append(pointer[u])
+                u=head[pointer[u]]
+            else:                           #dead end, retreat and never come back this phase
+                if u==source:
+                    break
+                level[u]=-1
+                e=path.pop()
+                u=head[reverse[e]]
+                pointer[u]+=1
+
+
+def push_relabel(graph: Graph,source:int,sink:int)->int:
+    """
+    Function Description: max flow with highest label push relabel, nodes hold excess flow and push it to neighbours one 
+                          height lower, always working on the highest active node. heights start as the BFS distance to the
+                          sink, and with the gap heuristic when no node is left at some height below |D| every node above it
+                          can no longer reach the sink so they are lifted straight over the source to send their excess back.
+
+    @param graph: the residual network, it is left holding a max preflow
+    @param source: the node the flow comes from
+    @param sink: the node the flow goes to
+    @return the value of the max flow
 
-def maxThroughput(connections: list,maxIn:list,maxOut:list,origin:int,targets:list)->int:
+    time complexity: O(|D|^2*sqrt(|C|)) where D is the data centres (nodes) and C the communication channels (edges)
+    aux space complexity: O(|D|)
+    """
+    n=graph.length
+    offsets=graph.offsets
+    head=graph.head
+    capacity=graph.capacity
+    flows=graph.flow
+    reverse=graph.reverse
+    height=[n]*n
+    excess=[0]*n
+    current=offsets[:n]
+
+    height[sink]=0                          #global relabel, distance to the sink in the residual network
+    queue=deque([sink])
+    while len(queue)>0:
+        v=queue.popleft()
+        for e in range(offsets[v],offsets[v+1]):
+            u=head[e]
+            back=reverse[e]
+            if flows[back]<capacity[back] and height[u]==n and u!=sink:
+                height[u]=height[v]+1
+                queue.append(u)
+    height[source]=n
+
+    count=[0]*(2*n+1)
+    for v in range(n):
+        if v!=source:
+            count[height[v]]+=1
+    buckets=[[] for _ in range(2*n+1)]      #active nodes by height
+    highest=0
+    for e in range(offsets[source],offsets[source+1]):  #saturate everything leaving the source
+        if flows[e]<capacity[e]:
+            v=head[e]
+            pushed=capacity[e]-flows[e]
+            if excess[v]==0 and v!=sink and v!=source:
+                buckets[height[v]].append(v)
+                highest=max(highest,height[v])
+            excess[v]+=pushed
+            flows[e]+=pushed
+            flows[reverse[e]]-=pushed
+
+    while highest>=0:
+        if len(buckets[highest])==0:
+            highest-=1
+            continue
+        u=buckets[highest].pop()
+        if height[u]!=highest:              #moved by a gap, file it under its new height
+            buckets[height[u]].append(u)
+            highest=max(highest,height[u])
+            continue
+        start=offsets[u]
+        end=offsets[u+1]
+        while excess[u]>0:                  #discharge u
+            if current[u]==end:             #relabel
+                old=height[u]
+                new=2*n
+                for e in range(start,end):
+                    if flows[e]<capacity[e] and height[head[e]]+1<new:
+                        new=height[head[e]]+1
+                count[old]-=1
+                if count[old]==0 and old<n: #gap, nothing above it can reach the sink
+                    for v in range(n):
+                        if old<height[v]<n and v!=source:
+                            count[height[v]]-=1
+                            height[v]=n+1
+                            count[n+1]+=1
+                    new=max(new,n+1)
+                height[u]=new
+                count[new]+=1
+                current[u]=start
+                continue
+            e=current[u]
+            v=head[e]
+            if flows[e]<capacity[e] and height[u]==height[v]+1:
+                pushed=min(excess[u],capacity[e]-flows[e])
+                flows[e]+=pushed
+                flows[reverse[e]]-=pushed
+                excess[u]-=pushed
+                if excess[v]==0 and v!=sink and v!=source:
+                    buckets[height[v]].append(v)
+                    highest=max(highest,height[v])
+                excess[v]+=pushed
+            else:
+                current[u]+=1
+    return excess[sink]
+
+
+def capacity_scaling(graph: Graph,source:int,sink:int)->int:
+    """
+    Function Description: max flow with capacity scaling, with a threshold delta starting at the biggest power of two 
+                          below the largest capacity we only augment along paths where every arc can take at least delta 
+                          more, once there are none left delta is halved. the big capacities are filled with a few big 
+                          augmentations first instead of many tiny ones along the same paths.
+
+    @param graph: the residual network, it is left holding the max flow
+    @param source: the node the flow comes from
+    @param sink: the node the flow goes to
+    @return the value of the max flow
+
+    time complexity: O(|C|^2*log(U)) where C the communication channels (edges) and U the largest capacity
+    aux space complexity: O(|D|)
+    """
+    delta=1
+    largest=max(graph.capacity,default=0)
+    while delta*2<=largest:
+        delta*=2
+    flow=0
+    while delta>=1:
+        flow+=graph.augment(source,sink,float("inf"),delta)
+        delta//=2
+    return flow
+
+
+def max_flow(graph: Graph,source:int,sink:int,method:str)->int:
+    """
+    runs the max flow engine called method from the current flow in graph
+
+    @raises ValueError: if there is no engine called method
+
+    time complexity: the complexity of the engine
+    aux space complexity: O(|D|)
+    """
+    if method=="dinic":
+        return dinic(graph,source,sink)
+    if method=="push_relabel":
+        return push_relabel(graph,source,sink)
+    if method=="scaling":
+        return capacity_scaling(graph,source,sink)
+    if method=="edmonds_karp":
+        return graph.augment(source,sink,float("inf"))
+    raise ValueError("unknown max flow method: "+str(method))
+
+
+def benchmark_max_flow(connections: list,maxIn:list,maxOut:list,origin:int,targets:list,
+                       methods:tuple=("edmonds_karp","dinic","push_relabel","scaling"),repeat:int=3)->dict:
+    """
+    Function Description: times the max flow engines on the split node graph Graph builds for one query, the graph is built
+                          once and its flow is reset before every run so only the engines themselves are timed. each engine 
+                          is run repeat times and the best run is kept, they all have to agree on the throughput.
+
+    @param connections: the list of (u, v, throughput) channels
+    @param maxIn: list of the maximum flow in values
+    @param maxOut: list of the maximum flow out values
+    @param origin: the id of the source data centre
+    @param targets: list of the targets we want to go to
+    @param methods: the engines to time, see max_flow
+    @param repeat: how many times to run each engine
+    @return a dictionary of the milliseconds each engine took, and "graph" for building the graph
+    @raises RuntimeError: if two engines give a different throughput
+
+    time complexity: O(repeat*M*F) where M is the amount of methods and F the cost of one max flow
+    aux space complexity: O(|C|+|D|)
+    """
+    begin=time.perf_counter()
+    graph=Graph(connections,maxIn,maxOut,origin,targets)
+    results={"graph": (time.perf_counter()-begin)*1000}
+    throughPut=None
+    for method in methods:
+        best=float("inf")
+        for _ in range(repeat):
+            graph.reset_flow()
+            begin=time.perf_counter()
+            flow=max_flow(graph,origin*3+1,graph.supersink,method)
+            best=min(best,time.perf_counter()-begin)
+            if throughPut is not None and flow!=throughPut:
+                raise RuntimeError(method+" found a throughput of "+str(flow)+" instead of "+str(throughPut))
+            throughPut=flow
+        results[method]=best*1000
+    return results
+
+
+def maxThroughput(connections: list,maxIn:list,maxOut:list,origin:int,targets:list,method:str="edmonds_karp")->int:
     """
     Function Description:  find the max throughput from the list of data centres and their connnections given their max for in and out
 
-    function approach: I wanted to make an adjacency_list representation of the graph so I can work with it as I am most familiar with this representation,
+    function approach: I wanted to make a residual network of the graph stored in flat arrays with a reverse arc for every arc so flow can be cancelled,
     I also wanted to use them for some bfs so i made a graph class which will group the attributes I will use as well as some useful methods e.g. self.BFS.
     This makes the first step be to make the graph so we can have this useful object.
     I then wanted to start using the Edmond Karp method to augment the flow and find the maxThroughPut.
@@ -149,10 +512,10 @@ def maxThroughput(connections: list,maxIn:list,maxOut:list,origin:int,targets:li
     through it is less than the capacity as that means we will be able to augment it and its not at its max flow already.
     The BFS will cause the algorithm loops over maximum times the amount of edges as we will cut off one path each time when we augment.
     If there is a path then we will find the maximum flow we can add to this path and add that to 
-    the maximum throughput. We then update all the flows we have augmented. Then return the maxThroughput.
+    the maximum throughput. We then update all the flows we have augmented and take it off their reverse arcs. Then return the maxThroughput.
     --------------------------------------------------------------------------------------------------------------------------------------------------------------
     For the creation of the graph we at most will have to go through the list of data centre against the list of communication channaels in the case where
-    the targets are essentially the size of data centres this means constructing them is costing O(|D|*|C|) time and O(|C|+|D|) aux space   
+    the targets are essentially the size of data centres, the target capacities come from one pass over the channels so constructing them is costing O(|C|+|D|) time and O(|C|+|D|) aux space   
 
     within the main function we will go over a loop for as long as there is a valid path, this will occur O(|C||D|) times as we will cut off one edge from the 
     graph each time when we augment hence cutting off a path to the supersink however it may still become critiscal therefore the complexity, this BFS search also 
@@ -167,6 +530,8 @@ def maxThroughput(connections: list,maxIn:list,maxOut:list,origin:int,targets:li
     @param maxOut: a matrix which has the maximum flow out for a vertex to go to another.
     @param origin: the id of the source data channel (vertex)
     @param targets: list of the targets we want to go to
+    @param method: "edmonds_karp" for the original search, "dinic" or "push_relabel" for the faster max flow engines 
+                   which run on the same residual network, "scaling" for capacity scaling when the capacities are far apart
     @return: the maximum throughput which can be sent to the targets
 
     time complexity: O(|C|^2 *|D|) where D is the data centres (nodes) and C the communication channels (edges)
@@ -174,8 +539,10 @@ def maxThroughput(connections: list,maxIn:list,maxOut:list,origin:int,targets:li
     """
     
     
-    graph = Graph(connections,maxIn,maxOut,origin,targets)  #create a graph object from the inputted paramaters time O(|D|*|C|)
+    graph = Graph(connections,maxIn,maxOut,origin,targets)  #create a graph object from the inputted paramaters time O(|D|+|C|)
                                                                                                         #aux space O(|D|+|C|)
+    if method!="edmonds_karp":
+        return max_flow(graph,graph.source*3+1,graph.supersink,method)
     
     throughPut=0
     preds=[None] * graph.length             #initialise preds to be none ye aux O(|D|)
@@ -186,24 +553,21 @@ def maxThroughput(connections: list,maxIn:list,maxOut:list,origin:int,targets:li
         if preds[graph.supersink] is None:  #if for some reason predsof supersink is none terminate
             break
         searching_flow=float("inf") 
-        current_flow=float("inf")       #set these to infinite
-        v = preds[graph.supersink]
+        node=graph.supersink
 
-        while v is not None:            #goes through the preds which could be O(|D|) worst case
-            index=v[1]
-            node=v[0]
-            current_flow=graph.capacity[node][index][1]-graph.flow[node][index][1]
-            searching_flow=min(searching_flow,current_flow)
-            v=preds[node]
+        while node!=graph.source*3+1:   #goes through the preds which could be O(|D|) worst case
+            arc=preds[node]
+            searching_flow=min(searching_flow,graph.capacity[arc]-graph.flow[arc])
+            node=graph.head[graph.reverse[arc]]
 
         throughPut+=searching_flow
 
-        v=preds[graph.supersink]
-        while v is not None:            #goes through the preds which could be O(|D|) worst case
-            index=v[1]
-            node=v[0]
-            graph.flow[node][index][1]+=searching_flow   
-            v=preds[node]
+        node=graph.supersink
+        while node!=graph.source*3+1:   #goes through the preds which could be O(|D|) worst case
+            arc=preds[node]
+            graph.flow[arc]+=searching_flow             # the reverse arc gets the flow back so it can be cancelled later
+            graph.flow[graph.reverse[arc]]-=searching_flow
+            node=graph.head[graph.reverse[arc]]
         
         preds=[None]* graph.length
     #O(|D|*|C|^2)
@@ -211,6 +575,390 @@ def maxThroughput(connections: list,maxIn:list,maxOut:list,origin:int,targets:li
     return throughPut
 
 
+class ThroughputSolver:
+    """
+    Keeps the residual network and the max flow of the last solve so the throughput can be found again after a channel,
+    maxIn or maxOut changes without starting from zero flow. when a capacity goes up the old flow is still valid so we only
+    augment more, when it goes down below the flow on the arc the extra flow is first rerouted around the arc, whatever
+    can not be rerouted is cancelled back to the source and from the supersink and then we augment again.
+
+    Attributes;
+    graph: the Graph holding the residual network and the current flow
+    source: the node the flow comes from
+    sink: the supersink
+    throughPut: the current maximum throughput
+    """
+    def __init__(self,connections: list,maxIn:list,maxOut:list,origin:int,targets:list):
+        """
+        builds the graph and solves it once with dinic
+
+        time complexity: O(|D|^2*|C|) where D is the data centres (nodes) and C the communication channels (edges)
+        aux space complexity: O(|C|+|D|)
+        """
+        self.graph=Graph(connections,list(maxIn),list(maxOut),origin,targets)
+        self.source=origin*3+1
+        self.sink=self.graph.supersink
+        self.throughPut=dinic(self.graph,self.source,self.sink)
+
+    def set_channel(self,index:int,capacity:int)->int:
+        """
+        Function Description: changes the throughput of the channel connections[index]
+
+        @param index: the position of the channel in connections
+        @param capacity: the new throughput of the channel
+        @return the new maximum throughput
+
+        time complexity: O(|D|^2*|C|) worst case, usually a few augmenting paths
+        aux space complexity: O(|D|)
+        """
+        graph=self.graph
+        centre=graph.connections[index][1]
+        delta=capacity-graph.capacity[graph.arcs[index]]
+        self.change_capacity(graph.arcs[index],capacity)
+        if graph.sinkArc[centre]>=0:        # the channel also counts towards what its target can take
+            self.change_target(centre,graph.inSum[centre]+delta)
+        return self.solve()
+
+    def set_max_in(self,centre:int,capacity:int)->int:
+        """
+        Function Description: changes the maxIn of a data centre
+
+        @param centre: the id of the data centre
+        @param capacity: its new maxIn
+        @return the new maximum throughput
+
+        time complexity: O(|D|^2*|C|) worst case, usually a few augmenting paths
+        aux space complexity: O(|D|)
+        """
+        graph=self.graph
+        delta=capacity-graph.maxIn[centre]
+        graph.maxIn[centre]=capacity
+        self.change_capacity(graph.arcs[len(graph.connections)+centre*2],capacity)
+        if graph.sinkArc[centre]>=0:
+            self.change_target(centre,graph.inSum[centre]+graph.inDegree[centre]*delta)
+        return self.solve()
+
+    def set_max_out(self,centre:int,capacity:int)->int:
+        """
+        Function Description: changes the maxOut of a data centre, a target is not limited by its maxOut so for a target
+                              only what it can take changes
+
+        @param centre: the id of the data centre
+        @param capacity: its new maxOut
+        @return the new maximum throughput
+
+        time complexity: O(|D|^2*|C|) worst case, usually a few augmenting paths
+        aux space complexity: O(|D|)
+        """
+        graph=self.graph
+        delta=capacity-graph.maxOut[centre]
+        graph.maxOut[centre]=capacity
+        if graph.sinkArc[centre]>=0:
+            self.change_target(centre,graph.inSum[centre]+graph.inDegree[centre]*delta)
+        else:
+            self.change_capacity(graph.arcs[len(graph.connections)+centre*2+1],capacity)
+        return self.solve()
+
+    def change_target(self,centre:int,capacity:int)->None:
+        """
+        sets what a target can take, both its arc through the middle node and its arc to the supersink
+
+        time complexity: O(|C|*|D|*(|C|+|D|)) worst case
+        aux space complexity: O(|D|)
+        """
+        graph=self.graph
+        graph.inSum[centre]=capacity
+        self.change_capacity(graph.arcs[len(graph.connections)+centre*2+1],capacity)
+        self.change_capacity(graph.sinkArc[centre],capacity)
+
+    def change_capacity(self,arc:int,capacity:int)->None:
+        """
+        Function Description: sets the capacity of an arc and repairs the flow if there is now more flow on it than it can 
+                              take. the extra flow leaves a surplus at the tail u and a shortage at the head v, first we try 
+                              to send it from u to v another way, then what is left is sent from u back to the source and from
+                              the supersink back to v which always works as the flow came along those paths.
+
+        @param arc: the id of the arc
+        @param capacity: its new capacity
+        @postcondition the flow in graph is a valid flow again, throughPut is lowered by whatever had to be cancelled
+
+        time complexity: O(|C|*|D|*(|C|+|D|)) worst case
+        aux space complexity: O(|D|)
+        """
+        graph=self.graph
+        graph.capacity[arc]=capacity
+        extra=graph.flow[arc]-capacity
+        if extra<=0:
+            return
+        u=graph.head[graph.reverse[arc]]
+        v=graph.head[arc]
+        graph.flow[arc]=capacity
+        graph.flow[graph.reverse[arc]]=-capacity
+        extra-=graph.augment(u,v,extra)     # reroute around the arc
+        if extra==0:
+            return
+        if u!=self.source:                  # cancel the rest
+            graph.augment(u,self.source,extra)
+        if v!=self.sink:
+            graph.augment(self.sink,v,extra)
+        self.throughPut-=extra
+
+    def solve(self)->int:
+        """
+        augments from the current flow until there is no path left
+
+        time complexity: O(|D|^2*|C|) worst case, usually a few augmenting paths
+        aux space complexity: O(|D|)
+        """
+        self.throughPut+=dinic(self.graph,self.source,self.sink)
+        return self.throughPut
+
+
+_worker_graph=None
+_worker_targets=None
+_worker_method=None
+
+def _attach_graph(connections: list,maxIn:list,maxOut:list,targets:list,method:str)->None:
+    """
+    pool initializer, builds the graph once per worker process with an arc to the supersink for every centre
+    """
+    global _worker_graph, _worker_targets, _worker_method
+    _worker_graph=single_target_graph(connections,maxIn,maxOut)
+    _worker_targets=targets
+    _worker_method=method
+
+def _table_worker(origin:int)->list:
+    """
+    finds the throughput from one origin to every target in a worker process
+    """
+    return single_target_flows(_worker_graph,origin,_worker_targets)
+
+def _batch_worker(query:tuple)->int:
+    """
+    answers one (origin, targets) query in a worker process
+    """
+    origin, targets = query
+    return query_flow(_worker_graph,origin,targets,_worker_method)
+
+def single_target_graph(connections: list,maxIn:list,maxOut:list)->Graph:
+    """
+    Function Description: builds a Graph where every centre has an arc to the supersink but none of them are targets yet,
+                          so any targets can be switched on with set_target without building the graph again.
+
+    @param connections: the list of (u, v, throughput) channels
+    @param maxIn: list of the maximum flow in values
+    @param maxOut: list of the maximum flow out values
+    @return the Graph
+
+    time complexity: O(|C|+|D|)
+    aux space complexity: O(|C|+|D|)
+    """
+    graph=Graph(connections,maxIn,maxOut,0,range(len(maxIn)))
+    for centre in range(len(maxIn)):
+        graph.set_target(centre,False)
+    return graph
+
+def single_target_flows(graph: Graph,origin:int,targets:list)->list:
+    """
+    Function Description: the max throughput from origin to each target on its own, the flow is reset and only that 
+                          target is switched on for each solve
+
+    @param graph: a Graph from single_target_graph
+    @param origin: the id of the source data centre
+    @param targets: the ids of the targets
+    @return list of the throughput to each target, None where the target is the origin
+
+    time complexity: O(|T|*|D|^2*|C|) where T is the amount of targets
+    aux space complexity: O(|C|+|D|)
+    """
+    flows=[]
+    for target in targets:
+        if target==origin:
+            flows.append(None)
+        else:
+            flows.append(query_flow(graph,origin,[target]))
+    return flows
+
+def query_flow(graph: Graph,origin:int,targets:list,method:str="dinic")->int:
+    """
+    Function Description: the max throughput from origin to targets on a graph from single_target_graph, the flow is 
+                          reset, the targets are switched on for the solve and switched off again after
+
+    @param graph: a Graph from single_target_graph
+    @param origin: the id of the source data centre
+    @param targets: list of the targets we want to go to
+    @param method: the max flow engine, see maxThroughput
+    @return the maximum throughput which can be sent to the targets
+
+    time complexity: O(|C|+|D|) plus the max flow engine
+    aux space complexity: O(|C|+|D|)
+    """
+    graph.reset_flow()
+    for target in targets:
+        graph.set_target(target,True)
+    flow=max_flow(graph,origin*3+1,graph.supersink,method)
+    for target in targets:
+        graph.set_target(target,False)
+    return flow
+
+def maxThroughput_batch(connections: list,maxIn:list,maxOut:list,queries:list,method:str="dinic",workers:int=None,chunksize:int=16)->list:
+    """
+    Function Description: answers many maxThroughput queries on the same channels, maxIn and maxOut. every worker process
+                          builds the split node graph once with an arc to the supersink from every centre and then only 
+                          resets the flow and switches the targets of each query on and off.
+
+    @param connections: the list of (u, v, throughput) channels
+    @param maxIn: list of the maximum flow in values
+    @param maxOut: list of the maximum flow out values
+    @param queries: a list of (origin, targets) tuples
+    @param method: the max flow engine, see maxThroughput
+    @param workers: the amount of processes, defaults to the amount of cpus
+    @param chunksize: how many queries are handed to a process at a time
+    @return the list of throughputs in the same order as queries
+
+    time complexity: O(|C|+|D|+Q*F/W) where Q is the amount of queries, F the cost of one max flow and W the workers
+    aux space complexity: O(|C|+|D|) per worker
+    """
+    if workers is None:
+        workers=os.cpu_count() or 1
+    if workers<=1 or len(queries)<=chunksize:
+        graph=single_target_graph(connections,maxIn,maxOut)
+        return [query_flow(graph,origin,targets,method) for origin, targets in queries]
+
+    with Pool(workers,initializer=_attach_graph,initargs=(connections,maxIn,maxOut,None,method)) as pool:
+        return pool.map(_batch_worker,queries,chunksize)
+
+
+TABLE_MAGIC=b"DCTT"
+TABLE_VERSION=2
+TABLE_HEADER=struct.Struct("<4sIQQQ")   #magic, version, n, amount of origins, amount of targets
+
+class ThroughputTable:
+    """
+    The max throughput between many origin and target pairs of the same network worked out up front so every pair is
+    then a lookup. the network is directed and a target takes flow up to its own inSum so the throughput from a to b is
+    not the same as from b to a and it is not a min cut between the two, this means a cut tree can not hold it and 
+    every pair needs its own max flow. the origins are split over a pool of processes which each build the graph once.
+    only single targets are stored, a query with several targets is not the sum of them so it still needs maxThroughput.
+
+    Attributes;
+    n: the amount of data centres
+    origins: array of the origins worked out, in the order of the rows of flows
+    targets: array of the targets worked out, in the order of the columns of flows
+    origin_index, target_index: the row and column of each origin and target in flows
+    flows: flat array where flows[origin_index[origin]*len(targets)+target_index[target]] is the throughput, -1 if there
+           is none
+    """
+    def __init__(self,connections: list,maxIn:list,maxOut:list,origins:list=None,targets:list=None,workers:int=None):
+        """
+        works out the throughput for every origin in origins to every target in targets, all the centres by default
+
+        @param workers: the amount of processes, defaults to the amount of cpus
+
+        time complexity: O(|O|*|T|*|D|^2*|C|/W) where O are the origins, T the targets and W the workers
+        aux space complexity: O(|O|*|T|) plus O(|C|+|D|) per worker
+        """
+        self.n=len(maxIn)
+        if origins is None:
+            origins=range(self.n)
+        if targets is None:
+            targets=range(self.n)
+        self.origins=array('q',dict.fromkeys(origins))     #without repeats, in the order given
+        self.targets=array('q',dict.fromkeys(targets))
+        self._index()
+        if workers is None:
+            workers=os.cpu_count() or 1
+        if workers<=1 or len(self.origins)<=1:
+            graph=single_target_graph(connections,maxIn,maxOut)
+            rows=[single_target_flows(graph,origin,self.targets) for origin in self.origins]
+        else:
+            with Pool(workers,initializer=_attach_graph,initargs=(connections,maxIn,maxOut,list(self.targets),"dinic")) as pool:
+                rows=pool.map(_table_worker,self.origins,1)
+
+        self.flows=array('q')
+        for row in rows:                        #time: O(|O|*|T|)
+            self.flows.extend(-1 if flow is None else flow for flow in row)
+
+    def _index(self)->None:
+        """
+        makes origin_index and target_index from origins and targets
+
+        time complexity: O(|O|+|T|)
+        """
+        self.origin_index={origin: i for i, origin in enumerate(self.origins)}
+        self.target_index={target: i for i, target in enumerate(self.targets)}
+
+    def throughput(self,origin:int,target:int)->int:
+        """
+        the max throughput from origin to the single target
+
+        @raises ValueError: if the pair was not worked out
+
+        time complexity: O(1)
+        aux space complexity: O(1)
+        """
+        row=self.origin_index.get(origin)
+        column=self.target_index.get(target)
+        flow=-1 if row is None or column is None else self.flows[row*len(self.targets)+column]
+        if flow<0:
+            raise ValueError("the throughput from "+str(origin)+" to "+str(target)+" was not precomputed")
+        return flow
+
+    def save(self,path:str)->None:
+        """
+        writes the table to a binary file so it can be loaded later instead of being worked out again. the file is a 32 
+        byte header (TABLE_HEADER: magic, version, n, amount of origins, amount of targets) then origins, targets and 
+        flows as little endian 8 byte ints.
+
+        @param path: the file to write to
+
+        time complexity: O(|O|*|T|)
+        aux space complexity: O(|O|*|T|) only on big endian machines where the arrays are swapped first
+        """
+        with open(path,"wb") as file:
+            file.write(TABLE_HEADER.pack(TABLE_MAGIC,TABLE_VERSION,self.n,len(self.origins),len(self.targets)))
+            for values in (self.origins,self.targets,self.flows):
+                if sys.byteorder=="big":
+                    values=array('q',values)
+                    values.byteswap()
+                file.write(memoryview(values).cast('B'))
+
+    @classmethod
+    def load(cls,path:str)->"ThroughputTable":
+        """
+        loads a table written by save, the arrays are read straight into typed arrays so nothing but numbers is read
+
+        @param path: the file to read from
+        @return the ThroughputTable
+        @raises ValueError: if the file is not a throughput table file or is truncated
+
+        time complexity: O(|O|*|T|)
+        aux space complexity: O(|O|*|T|)
+        """
+        with open(path,"rb") as file:
+            data=file.read()
+        if len(data)<TABLE_HEADER.size:
+            raise ValueError(path+" is not a throughput table file")
+        magic, version, n, origins, targets = TABLE_HEADER.unpack_from(data,0)
+        if magic!=TABLE_MAGIC or version!=TABLE_VERSION:
+            raise ValueError(path+" is not a throughput table file")
+        sizes=(origins,targets,origins*targets)
+        if len(data)!=TABLE_HEADER.size+8*sum(sizes):
+            raise ValueError(path+" is truncated")
+        table=cls.__new__(cls)
+        table.n=n
+        position=TABLE_HEADER.size
+        for name, size in zip(("origins","targets","flows"),sizes):
+            values=array('q')
+            values.frombytes(data[position:position+8*size])
+            if sys.byteorder=="big":
+                values.byteswap()
+            setattr(table,name,values)
+            position+=8*size
+        table._index()
+        return table
+
+
 
 
 class CatNode:
@@ -221,6 +969,9 @@ class CatNode:
     child_array: the child_array of this node
     frequency: the frequency of this string occuring present at terminating character 
     highest_frequency: the highest frequency of the occurences of the words ending below it
+    best: the word autoComplete gives for this node, the most frequent word ending below it and the alphabetically first
+          of those on a tie, for the terminating character it is the word that ends there. it is the same string object 
+          as the inserted word so no completion is stored twice
     
     """
     def __init__(self,character) -> None:
@@ -234,6 +985,7 @@ class CatNode:
         self.child_array = [None]*27
         self.frequency=0
         self.highest_freq=0
+        self.best=None
     def __repr__(self) -> str:
         return str(self.highest_freq)
 # The CatsTrie class structure
@@ -241,7 +993,8 @@ class CatsTrie:
     """a class representing a prefix trie data struture made up of catNodes
 
     Attributes;
-    sentences: the list of sentences we will make
+    sentences: the list of sentences the trie was built from, add and remove do not change it so the trie itself holds
+               the current sentences and their frequencies
     root: the root of the trie
 
     """
@@ -271,19 +1024,23 @@ class CatsTrie:
         self.update_max_frequencies()
         
 
-    def insert(self,word:str) -> None:
+    def insert(self,word:str,count:int=1) -> list:
         """
         function description: insert a word to the prefix tree stemming from the root
 
         @param word: the word we are inserting to the trie
+        @param count: how many times the word occurs
+        @return the nodes along the path of the word from the root to its terminating character
 
         time comp: O(M) where M is the length of the word
         aux space comp: O(26*M)->O(M) where M is the length of the word
         """
 
         node=self.root                  # start at root
+        sentence=word
         word="".join([word,'{'])        # time comp: O(M)
         arr=node.child_array            #get child array
+        path=[node]
 
         for c in word:                  # go down array and find index and insert there
             index = self.get_index(c)   # if there is no node there then add a new one else just move onto the next one
@@ -293,7 +1050,59 @@ class CatsTrie:
             else:
                 newNode = arr[index]  
             arr = newNode.child_array
-        newNode.frequency+=1            # increment frequency at the terminating character
+            path.append(newNode)
+        newNode.frequency+=count        # increment frequency at the terminating character
+        newNode.best=sentence
+        return path
+
+    def add(self,sentence:str,count:int=1) -> None:
+        """
+        function description: adds a sentence to a trie that is already built, only the nodes on its path can have a new highest
+                              frequency or best word so they are refreshed from the bottom up instead of calling update_max_frequencies
+
+        @param sentence: the sentence to add
+        @param count: how many times it occurs
+
+        time comp: O(M) where M is the length of the sentence
+        aux space comp: O(M)
+        """
+        path=self.insert(sentence,count)
+        for i in range(len(path)-2,-1,-1):  # every node above the terminating character O(27*M)->O(M)
+            self.refresh(path[i])
+
+    def remove(self,sentence:str,count:int=None) -> bool:
+        """
+        function description: takes count occurences of a sentence out of the trie, all of them by default, once none are left
+                              its terminating character is removed along with any nodes that no longer lead to a word, the rest 
+                              of the path is refreshed from the bottom up
+
+        @param sentence: the sentence to remove
+        @param count: how many occurences to take away
+        @return whether the sentence was in the trie
+
+        time comp: O(M) where M is the length of the sentence
+        aux space comp: O(M)
+        """
+        node=self.root
+        path=[node]
+        for c in "".join([sentence,'{']):   # O(M)
+            node=node.child_array[self.get_index(c)]
+            if node is None:
+                return False
+            path.append(node)
+        if count is None or count>=node.frequency:
+            node.frequency=0
+        else:
+            node.frequency-=count
+
+        i=len(path)-1                       # from the terminating character up, remove a node if nothing is left below it O(27*M)->O(M)
+        while i>0 and (path[i].frequency==0 if path[i].char=="{" else all(child is None for child in path[i].child_array)):
+            path[i-1].child_array[self.get_index(path[i].char)]=None
+            i-=1
+        for j in range(i,-1,-1):
+            if path[j].char!="{":
+                self.refresh(path[j])
+        return True
 
     def get_index(self,c) -> int:
         """
@@ -308,7 +1117,7 @@ class CatsTrie:
     def update_max_frequencies(self):
         """function to call upon the aux recursive function 
 
-        @postconditions the highest frequencies of all catnodes in trie wil now be updated with valid values.
+        @postconditions the highest frequencies and best words of all catnodes in trie wil now be updated with valid values.
         
         time comp: O(N*M) where N is the amount of strings and M the length of the longest
         aux space comp: O(M) as depth of recursion is the length of M which is the longest string
@@ -317,20 +1126,44 @@ class CatsTrie:
         return self.update_aux(node)
     
     def update_aux(self,node:CatNode):
-        """function will go down till the bottom node, terminating character, and return up the max indexes and update the highest frequencies of the nodes above
+        """function will go down till the bottom node, terminating character, and return up the max indexes and update the highest frequencies 
+        and best words of the nodes above
         
         @param node: the node we are currently at
         
         time comp: O(N*M) where N is the amount of strings and M the length of the longest
         aux space comp: O(M) as depth of recursion is the length of M which is the longest string
         """
-        max_frequency=0
-        for i in range (27): ##go through each position in array and go down if not none and get that max freq
-            if node.child_array[i] is not None:
-                max_frequency=max(max_frequency,self.update_aux(node.child_array[i]))
         if node.char=="{":  #base case 
             return node.frequency
-        node.highest_freq=max_frequency #set to this on way back up
+        for i in range (26): ##go through each position in array and go down if not none so their max freq is right
+            if node.child_array[i] is not None:
+                self.update_aux(node.child_array[i])
+        return self.refresh(node) #set on way back up
+
+    def refresh(self,node:CatNode) -> int:
+        """sets the highest frequency and best word of a node from its children, which have to be right already. the terminating character is 
+        looked at first as the word ending here comes before any longer one alphabetically then a to z and a child only replaces it if it is 
+        strictly more frequent so ties stay alphabetical
+
+        @param node: the node to refresh, not a terminating character
+        @return the highest frequency of the node
+
+        time comp: O(1) as we only go through the list of alphabet size which is constant 
+        aux space comp: O(1)
+        """
+        max_frequency=0
+        node.best=None
+        terminal=node.child_array[26]
+        if terminal is not None:
+            max_frequency=terminal.frequency
+            node.best=terminal.best
+        for i in range (26):
+            child=node.child_array[i]
+            if child is not None and child.highest_freq>max_frequency:
+                max_frequency=child.highest_freq
+                node.best=child.best
+        node.highest_freq=max_frequency
         return max_frequency
     
 
@@ -341,55 +1174,66 @@ class CatsTrie:
         function approach:
         first just wanted frequencies at the terminating character then would get each word from the trie which has the prefix prompt, then compare and get
         minimum, This proved to work but was out of complexity bounds, therefore I attampted to use the property of a trie already beingin alphabetical order.
-        this was achieved by looping from the start and adding a new highest _frequency to the catNode to see if a path was worth searchin or not, this meant we 
-        weould not have Y be the longest string but instead just the most frequent as we will disregard longer unless it has more frequent appearances.
-        Also we would check if there were any more improvements in the highest frequency and if not we would terminate at that cjaracter which meant we would not keep
-        searching even if there was another with the same max but was a higher index thus not in alphabetical order.
+        this was achieved by looping from the start and adding a new highest _frequency to the catNode to see if a path was worth searchin or not.
+        now update_max_frequencies also keeps the best word at every node while it is working out the highest frequencies, so once we have walked
+        down the prompt the answer is already there and we do not have to go down the most frequent characters or look at the 27 children again.
         --------------------------------------------------------------------------------------------------------------------------------------------------------------
-        the complexity of join is O(n) where n is the length of the total output
-
-        the complexity of get_max is O(1) as the alphabet size is a constant O(26) -> O(1)
-
-        the complexity of search is O(M) where M is the length of the word to search for, as we will go down the trie till we find it which wil
-        occur M times if it is in it.
-
-        This algorithm itself also goes over the prefix provided to see how far we can go in trie O(X) from there it checks the most frequent nodes 
-        which are next and picks them therefore only does the most frequent words so O(Y) time complexity where Y is the length of the most frequent 
-        word with prefix prompt as we would terminate if no more frequent characters.
+        This algorithm goes over the prefix provided to see how far we can go in trie O(X) from there it just returns the best word kept at that node which
+        is O(1) as it is a reference to the string that was inserted.
         --------------------------------------------------------------------------------------------------------------------------------------------------------------
 
         @param prompt: the prefix we are tryingt to find the autocompleted version of from trie
-        @return the string of the autocompleted word from trie
+        @return the string of the autocompleted word from trie, None if no word starts with prompt
 
-        time comp: O(X+Y) where X is the length of the prompt and Y is the length of the most frequent word which has the prompt as a prefix
+        time comp: O(X) where X is the length of the prompt
         """
         node = self.root
-        arr=node.child_array
-        
-        search=self.search(prompt)                       #searched if prefix in word and if it is then check if it has max_frequency 
-        if search[0] and search[1]>=self.get_max(arr,0)[1]: #if so then return prompt as autocomplete
-            return prompt
-        
         for c in prompt:            #goes over the length of the prompt O(X)
-            index=self.get_index(c)
-            node=arr[index]
+            node=node.child_array[self.get_index(c)]
             if node is None:
                 return None
-            arr=node.child_array
-        
-        arr=node.child_array
-        old=node.highest_freq
-        new_str=[]
-
-        while node.char !="{":
-            index=self.get_max(arr,old)[0]
-            if index==26 or arr[index] is None:                   #if index is a terminating character then finish or if the node is none then we are done
-                break
-            node=arr[index]
-            new_str.append(node.char)           #O(1) append
-            arr=node.child_array
-        new_str="".join(new_str)            #O(Y) join
-        return "".join([prompt,new_str])    #O(Y) join
+        return node.best
+
+    def autoComplete_topk(self, prompt:str, k:int)->list:
+        """ 
+        the k most frequent words starting with prompt, the alphabetically first first when they have the same frequency
+
+        function approach:
+        a best first search from the node at the end of the prompt with a heap keyed on (-frequency, string). a word goes in with its own
+        frequency and a node goes in with its highest frequency and its prefix, as nothing below a node is more frequent than its highest 
+        frequency or comes before its prefix alphabetically a node always comes out of the heap before any word below it, so the words come
+        out in the right order and we can stop after k. a word and a node with the same key are told apart by a 0 for words and 1 for nodes 
+        so the word comes out first. only nodes that could still beat the words we have come out so it does not depend on how big the 
+        subtree is.
+
+        @param prompt: the prefix we want the completions of
+        @param k: how many completions we want
+        @return list of up to k words, empty if no word starts with prompt
+
+        time comp: O(X+k*Y*log(k*Y)) where X is the length of the prompt and Y the length of the longest completion
+        aux space comp: O(k*Y)
+        """
+        node = self.root
+        for c in prompt:            #goes over the length of the prompt O(X)
+            node=node.child_array[self.get_index(c)]
+            if node is None:
+                return []
+
+        words=[]
+        heap=[(-node.highest_freq,prompt,1,node)]
+        while len(heap)>0 and len(words)<k:
+            frequency, string, kind, node = heapq.heappop(heap)
+            if kind==0:
+                words.append(string)
+                continue
+            terminal=node.child_array[26]
+            if terminal is not None:
+                heapq.heappush(heap,(-terminal.frequency,terminal.best,0,None))
+            for i in range(26):
+                child=node.child_array[i]
+                if child is not None:
+                    heapq.heappush(heap,(-child.highest_freq,"".join([string,child.char]),1,child))
+        return words
         
     
     def search(self,word: str) :
@@ -414,28 +1258,147 @@ class CatsTrie:
                 return (True,node.frequency)
             node=arr[index]
         return (False,0)
-        
-    def get_max(self,arr:list,old_max):
+
+
+
+class FlatCatsTrie:
+    """a prefix trie with the same autoComplete as CatsTrie but with every node kept in flat typed arrays instead of a 
+    CatNode object with a 27 slot list, each node is a position in the arrays and its children are a linked list in 
+    alphabetical order (first child and next sibling). the terminating character is not a node, a node just counts the 
+    words that end at it.
+
+    Attributes;
+    sentences: the list of sentences we will make
+    char: the character of every node, the root has none
+    first_child: the first child of every node in alphabetical order, -1 if it has none
+    next_sibling: the next child of the same parent in alphabetical order, -1 if it is the last
+    frequency: how many times the word ending at every node occurs
+    highest_freq: the highest frequency of the words ending at or below every node
+    """
+    def __init__(self, sentences):
         """
-        gets the maximum index from the child array and returns its index or the terminating character if done
-       
-        @param arr: the list we will be searching through 
-        @param old_max: the max of the parent 
-        @return the index of the maximum element or the terminating character if finished
+        initialises the trie based on sentences
 
-        time comp: O(1) as we only go through the list of alphabet size which is constant 
-        aux space comp: O(1) nothing added
-        """
-        max=0
-        max_ind=0
-        for i in range (27):                #goes through the array and checks each one for the highest frequency to try update the max
-            if arr[i] is not None and arr[i].highest_freq>max:
-                max = arr[i].highest_freq
-                max_ind=i
-        if max<old_max and arr[-1] is not None: #if the max is less than old_max then where we are at is the best word so return 26 to terminate
-            return (26,max)
-        if arr[-1] is not None and arr[-1].frequency==max:  #if frequency is equal to the max and we can terminate then return 26 to terminate
-            return (26,max)
-
-        return (max_ind,max)
-       
+        @param sentences: the list of words we will be adding to the trie
+
+        time comp: O(N*M) where N is the amount of words in sentences and M the length of the longest word
+        aux space comp: O(N*M) at around 33 bytes a node
+        """
+        self.sentences=sentences
+        self.char=bytearray(1)
+        self.first_child=array('q',[-1])
+        self.next_sibling=array('q',[-1])
+        self.frequency=array('q',[0])
+        self.highest_freq=array('q',[0])
+        for word in self.sentences: #occurs N times 
+            self.insert(word)       #time comp is O(M)
+        self.update_max_frequencies()
+
+    def insert(self,word:str) -> None:
+        """
+        function description: insert a word to the prefix tree stemming from the root, a missing child is spliced into 
+                              its parents list of children so they stay in alphabetical order
+
+        @param word: the word we are inserting to the trie
+
+        time comp: O(26*M)->O(M) where M is the length of the word
+        aux space comp: O(M) where M is the length of the word
+        """
+        node=0
+        for c in word:
+            code=ord(c)
+            previous=-1
+            child=self.first_child[node]
+            while child>=0 and self.char[child]<code:   # at most 26 siblings to pass
+                previous=child
+                child=self.next_sibling[child]
+            if child<0 or self.char[child]!=code:
+                new=len(self.char)
+                self.char.append(code)
+                self.first_child.append(-1)
+                self.next_sibling.append(child)
+                self.frequency.append(0)
+                self.highest_freq.append(0)
+                if previous<0:
+                    self.first_child[node]=new
+                else:
+                    self.next_sibling[previous]=new
+                child=new
+            node=child
+        self.frequency[node]+=1
+
+    def update_max_frequencies(self) -> None:
+        """function to set the highest frequency of every node, a child is always added after its parent so going from the 
+        last node to the first every child is done before its parent and no recursion is needed
+
+        @postconditions the highest frequencies of all nodes in trie wil now be updated with valid values.
+
+        time comp: O(N*M) where N is the amount of strings and M the length of the longest
+        aux space comp: O(1)
+        """
+        for node in range(len(self.char)-1,-1,-1):
+            best=self.frequency[node]
+            child=self.first_child[node]
+            while child>=0:
+                if self.highest_freq[child]>best:
+                    best=self.highest_freq[child]
+                child=self.next_sibling[child]
+            self.highest_freq[node]=best
+
+    def find(self,prompt:str) -> int:
+        """
+        @param prompt: the prefix to walk down
+        @return the node at the end of prompt or -1 if it is not in the trie
+
+        time comp: O(26*X)->O(X) where X is the length of the prompt
+        aux space comp: O(1)
+        """
+        node=0
+        for c in prompt:
+            code=ord(c)
+            child=self.first_child[node]
+            while child>=0 and self.char[child]<code:
+                child=self.next_sibling[child]
+            if child<0 or self.char[child]!=code:
+                return -1
+            node=child
+        return node
+
+    def autoComplete(self, prompt:str)->str:
+        """ 
+        autocomplete for a given prefix, the most frequent word starting with prompt and the alphabetically first of those 
+        if there is a tie, None if no word starts with prompt. after walking the prompt we stop if the word ending here is 
+        as frequent as anything below, else we go to the first child in alphabetical order that leads to the highest frequency.
+
+        @param prompt: the prefix we are tryingt to find the autocompleted version of from trie
+        @return the string of the autocompleted word from trie
+
+        time comp: O(X+Y) where X is the length of the prompt and Y is the length of the most frequent word which has the prompt as a prefix
+        aux space comp: O(Y)
+        """
+        node=self.find(prompt)
+        if node<0 or self.highest_freq[node]==0:    # only the root of an empty trie has no word below it
+            return None
+        new_str=[prompt]
+        while self.frequency[node]<self.highest_freq[node]:
+            child=self.first_child[node]
+            while self.highest_freq[child]<self.highest_freq[node]:
+                child=self.next_sibling[child]
+            new_str.append(chr(self.char[child]))
+            node=child
+        return "".join(new_str)     #O(Y) join
+
+    def search(self,word: str) :
+        """
+        searches if the word is in the trie
+
+        @param word: the word we are searching for
+        @return a tuple containg a bool of whether the word is in and the frequency of the word
+
+        time comp: O(M) where M is the length of the word
+        space comp: O(1) 
+        """
+        node=self.find(word)
+        if node<0 or self.frequency[node]==0:
+            return (False,0)
+        return (True,self.frequency[node])